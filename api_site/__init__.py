@@ -1 +1,3 @@
-from . core import main
+from . core import (main, main_pages, get_coalesced_stats, get_query_stats, get_cache_stats, get_result_cache_stats,
+                    invalidate_search, get_rate_limit_budget, get_circuit_state, is_search_available,
+                    count_missing_pages, start_cache_janitor)
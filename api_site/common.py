@@ -1,11 +1,20 @@
-import json
-from typing import TypeVar, List
+import asyncio
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+from typing import TypeVar, List, Iterable, Dict
 from api_site.utils.product_obj import Product
-from api_site.utils.read_json_file import create_data_collection
+from api_site.utils.read_json_file import create_records
+from api_site.utils.record_codec import encode_records, decode_records
 from api_site.utils.request_api import request_api
+from api_site.utils.request_key import RequestKey
+from api_site.utils.result_store import ResultStore, StoreEntry
+from api_site.utils.background_refresh import BackgroundRefresher
+from api_site.utils.async_request_api import request_api_pages
 from api_site.utils.check_time_for_log import decorator_for_check_time
 from api_site.getiing_requests.request_model import ResponseAPISite
 from common_utils.config import Setting
+from common_utils.config_log import logger
 
 T = TypeVar('T')
 
@@ -13,51 +22,139 @@ T = TypeVar('T')
 class CallSiteAPI:
     """
     Общий класс для обработки запросов различных методов API.
+    Результаты запросов хранятся в ResultStore по строковому представлению канонического ключа запроса.
+    Результат старше Setting.get_cache_ttl() возвращается сразу, а его обновление выполняется в фоне.
     """
-    __path: str = Setting.get_path_for_json_dir()
+    __store: ResultStore = ResultStore(Setting.get_path_result_store())
+    __refresher: BackgroundRefresher = BackgroundRefresher(Setting.get_refresh_workers())
+    __writer: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='store_writer')
 
-    @staticmethod
-    def api_site_call_create_data(method: str, *param, **params) -> None:
+    @classmethod
+    def api_site_call_create_data(cls, key: RequestKey, query: str | None = None) -> List[Product] | None:
         """
-        Метод создает запрос впоследствии чего создается файл .json для обработки дальнейшими методами.
+        Метод выполняет запрос к API и возвращает товары из ответа, ответ сохраняется в хранилище в фоне.
         Params:
-            method: Тип запроса (str).
-            param : Параметр запроса (str).
-            params : Dict
+            key: Канонический ключ запроса (RequestKey).
+            query: Текст запроса пользователя для API, по умолчанию канонический текст ключа.
+        Returns:
+            List[Product] | None: Товары из ответа, в случае неудачного запроса None.
         """
-        request_api(ResponseAPISite, method, *param, **params)
+        data_json: Dict | None = request_api(ResponseAPISite, key, query)
+        if data_json:
+            return cls.save_data(key, data_json)
 
     @classmethod
-    def get_list_obj_with_product(cls, method, product) -> List | None:
+    def save_data(cls, key: RequestKey, data_json: Dict) -> List[Product]:
+        """
+        Метод сохраняет ответ API в хранилище по ключу запроса.
+        Из ответа сохраняются только поля Product.get_param_list() в компактном виде (record_codec).
+        Товары создаются сразу из разобранного ответа, а кодирование и запись в хранилище
+        выполняются в отдельном потоке, что бы не задерживать ответ пользователю.
+        Params:
+            key: Канонический ключ запроса (RequestKey).
+            data_json: Ответ API (Dict).
+        Returns:
+            List[Product]: Товары из ответа, в случае некорректного ответа пустой список.
+        """
+        try:
+            records: List[tuple] = create_records(data_json.get('data'), Product.get_param_list(),
+                                                  required=('product_id', 'price'))
+            objects_product_list: List[Product] = [Product.from_record(record) for record in records]
+        except TypeError as err:
+            logger.error(f'api_site/common.py Некорректный ответ API {key=}: {err=}')
+            return []
+        cls.__writer.submit(cls.__write, key, records)
+        return objects_product_list
+
+    @classmethod
+    def __write(cls, key: RequestKey, records: List[tuple]) -> None:
+        """Метод кодирует записи товаров и сохраняет их в хранилище (выполняется в потоке записи)."""
+        try:
+            cls.__store.put(key.to_str(), encode_records(records))
+        except Exception as err:
+            logger.error(f'api_site/common.py Не удалось сохранить результат {key=}: {err=}')
+
+    @classmethod
+    def get_list_obj_with_product(cls, key: RequestKey, query: str | None = None) -> List | None:
         """
         Метод возвращает список объектов с наименованием товаров.
         В случае не успеха возвращает None.
+        Если результат устарел, он все равно будет возвращен, а в фоне будет запрошен новый результат
+        с текстом запроса query.
         """
-        file_name: str = ''.join(f"{method}_{product}").lower()
-        path: str = f'{cls.__path}/{file_name}.json'
-        if Setting.check_path(path):
-            with open(path, 'r', encoding='UTF-8') as file:
-                data_json = json.load(file)
-                objects_product_list = create_data_collection(data_json.get('data'), Product.get_param_list(), Product)
-            return objects_product_list
+        entry: StoreEntry | None = cls.__store.get(key.to_str())
+        if entry:
+            if not entry.is_fresh(Setting.get_cache_ttl()):
+                cls.__refresher.schedule(key, cls.api_site_call_create_data, key, query)
+            try:
+                return [Product.from_record(record) for record in decode_records(entry.payload)]
+            except (ValueError, TypeError, zlib.error) as err:  # результат сохранен в другом формате.
+                logger.debug(f'api_site/common.py Не удалось прочитать сохраненный результат {key=}: {err=}')
+
+    @classmethod
+    def is_fresh(cls, key: RequestKey) -> bool:
+        """Метод возвращает True, если в хранилище есть актуальный результат по ключу."""
+        created_at: float | None = cls.__store.get_created_at(key.to_str())
+        return created_at is not None and time() - created_at < Setting.get_cache_ttl()
+
+    @classmethod
+    def get_store(cls) -> ResultStore:
+        """Метод возвращает хранилище результатов запросов."""
+        return cls.__store
 
 
 @decorator_for_check_time
-def request_product(method: str, product: str, **kwargs) -> List[Product] | None:
+def request_product(key: RequestKey, query: str | None = None) -> List[Product] | None:
     """
     Функция выполняет запросы пользователя, если запрос первый, то запрос идет с API,
-    Иначе извлекает данные из файла и отправляет готовый результат.
+    Иначе извлекает данные из хранилища и отправляет готовый результат.
     Params:
-        method: Метод запроса (str).
-        product: Цель запроса (str).
+        key: Канонический ключ запроса (RequestKey).
+        query: Текст запроса пользователя, который передается API, по умолчанию канонический текст ключа.
     Return:
         List object products (List) | None.
+    Notes:
+        При запросе к API ответ разбирается один раз и сразу преобразуется в товары,
+        повторное чтение из хранилища не выполняется.
     """
 
-    list_obj_products: List[Product] | None = CallSiteAPI().get_list_obj_with_product(method, product)
+    list_obj_products: List[Product] | None = CallSiteAPI.get_list_obj_with_product(key, query)
     if list_obj_products:
         return list_obj_products
-    else:
-        CallSiteAPI().api_site_call_create_data(method, product, **kwargs)
-        list_obj_products: List[Product] | None = CallSiteAPI().get_list_obj_with_product(method, product)
-        return list_obj_products
+    return CallSiteAPI.api_site_call_create_data(key, query)
+
+
+@decorator_for_check_time
+def request_product_pages(keys: Iterable[RequestKey], query: str | None = None) -> List[Product]:
+    """
+    Функция одновременно запрашивает несколько страниц результатов и объединяет их в один список.
+    Params:
+        keys: Канонические ключи запросов страниц (Iterable[RequestKey]).
+        query: Текст запроса пользователя, который передается API, по умолчанию канонический текст ключей.
+    Return:
+        List object products (List), товары повторяющиеся на разных страницах будут исключены.
+    Notes:
+        Каждая страница кешируется по собственному ключу. Страницы, которых нет в кеше,
+        запрашиваются одновременно, поэтому время ответа близко ко времени запроса одной страницы.
+        Одновременные запросы одной страницы (main(), другие наборы страниц, прогрев кеша) объединяются
+        по ключу страницы, поэтому каждая страница запрашивается у API один раз.
+    """
+    pages: Dict[RequestKey, List[Product] | None] = {key: CallSiteAPI.get_list_obj_with_product(key, query)
+                                                      for key in keys}
+    missing_keys: List[RequestKey] = [key for key, list_obj_products in pages.items() if not list_obj_products]
+    if missing_keys:
+        responses: List = asyncio.run(request_api_pages(request_product, missing_keys, query))
+        for key, response in zip(missing_keys, responses):
+            if isinstance(response, BaseException):
+                logger.error(f'api_site/common.py Не удалось запросить страницу {key=}: {response=}')
+            else:
+                pages[key] = response
+
+    list_obj_products: List[Product] = []
+    product_ids: set = set()
+    for page_products in pages.values():
+        for any_product in page_products or []:
+            if any_product.get_product_id() not in product_ids:
+                product_ids.add(any_product.get_product_id())
+                list_obj_products.append(any_product)
+    return list_obj_products
@@ -1,11 +1,149 @@
-from typing import List
-from functools import lru_cache
+from typing import List, Tuple, Dict, Iterable, Hashable
 from api_site.utils.product_obj import Product
-from api_site.common import request_product
+from api_site.utils.request_key import RequestKey, build_request_key
+from api_site.getiing_requests.rate_limiter import rate_limiter
+from api_site.getiing_requests.circuit_breaker import circuit_breaker, CircuitOpenError
+from api_site.utils.single_flight import single_flight
+from api_site.utils.cache_janitor import CacheJanitor
+from api_site.utils.query_normalizer import query_normalizer
+from api_site.utils.result_cache import ResultCache
+from api_site.utils.result_set import ResultSet
+from api_site.common import CallSiteAPI, request_product, request_product_pages
+from common_utils.config import Setting
+from common_utils.config_log import logger
 
+_cache_janitor: CacheJanitor = CacheJanitor(CallSiteAPI.get_store())
 
-@lru_cache(maxsize=1000)
-def main(method: str, product: str, **kwargs) -> List[Product]:
+
+def _sizeof_result(result: List[Product] | None) -> int:
+    """Функция оценивает объем результата в памяти по исходным свойствам товаров (Product.get_size_estimate())."""
+    return 64 + sum(any_product.get_size_estimate() for any_product in result or ())
+
+
+_result_cache: ResultCache = ResultCache(Setting.get_result_cache_max_bytes(), Setting.get_result_cache_ttl(),
+                                         Setting.get_result_cache_negative_ttl(), _sizeof_result)
+
+
+def start_cache_janitor() -> None:
+    """Функция запускает фоновый поток, который поддерживает хранилище результатов в пределах лимитов."""
+    if not _cache_janitor.is_alive():
+        _cache_janitor.start()
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Функция возвращает метрики хранилища результатов запросов.
+    Returns:
+        Dict: hits, misses, evictions, entries, bytes.
+    """
+    return CallSiteAPI.get_store().get_stats()
+
+
+def get_result_cache_stats() -> Dict[str, int]:
+    """
+    Функция возвращает счетчики кеша результатов в памяти.
+    Returns:
+        Dict: hits, negative_hits, misses, expired, evictions, rejected, invalidations, entries, bytes.
+    """
+    return _result_cache.get_stats()
+
+
+def invalidate_search(method: str, product: str, **kwargs) -> int:
+    """
+    Функция удаляет из кеша в памяти результаты запроса товара, в том числе объединенные результаты
+    нескольких страниц, содержащие этот запрос. Параметр page не учитывается, если не передан.
+    Returns:
+        int: Кол-во удаленных результатов.
+    """
+    key: RequestKey = build_request_key(method, query_normalizer.normalize(product, track=False), **kwargs)
+
+    def matches(cache_key: RequestKey | Tuple[RequestKey, ...]) -> bool:
+        for any_key in (cache_key,) if isinstance(cache_key, RequestKey) else cache_key:
+            if any_key == key or ('page' not in kwargs and any_key._replace(page=key.page) == key):
+                return True
+        return False
+
+    return _result_cache.invalidate_if(matches)
+
+
+def get_coalesced_stats() -> Dict[str, int]:
+    """
+    Функция возвращает счетчики объединения одновременных запросов к API.
+    Returns:
+        Dict: executed - выполненные запросы, coalesced - объединенные с ними запросы,
+            in_flight - запросы выполняемые в данный момент.
+    """
+    return single_flight.get_stats()
+
+
+def get_query_stats() -> Dict[str, int]:
+    """
+    Функция возвращает счетчики нормализации запросов.
+    Returns:
+        Dict: queries, rewritten - запросы, которые получили общий ключ кеша с другим написанием,
+            token_set_matches, known.
+    """
+    return query_normalizer.get_stats()
+
+
+def get_rate_limit_budget() -> Dict:
+    """
+    Функция возвращает текущее состояние лимитов запросов к API.
+    Returns:
+        Dict: tokens, rate, paused_for, quota_limit, quota_remaining, queued.
+    """
+    return rate_limiter.get_budget()
+
+
+def get_circuit_state() -> Dict:
+    """
+    Функция возвращает состояние circuit breaker запросов к API.
+    Returns:
+        Dict: state (closed | open | half_open), failures, rejected, trips, opened_for.
+    """
+    return circuit_breaker.get_state()
+
+
+def is_search_available() -> bool:
+    """Функция возвращает False, если API недоступен и поиск выполняется только по кешу."""
+    return circuit_breaker.is_closed()
+
+
+def count_missing_pages(method: str, product: str, pages: Iterable[int], **kwargs) -> int:
+    """
+    Функция возвращает кол-во страниц запроса, для которых нет актуального результата в хранилище,
+    то есть кол-во запросов к API, которые потребуются для ответа.
+    """
+    product: str = query_normalizer.normalize(product, track=False)
+    return sum(not CallSiteAPI.is_fresh(build_request_key(method, product, page=page, **kwargs)) for page in pages)
+
+
+def _cached(key: Hashable, func, *args) -> ResultSet | None:
+    """
+    Функция возвращает результат из кеша в памяти, иначе выполняет func (одновременные одинаковые
+    вызовы объединяются) и сохраняет результат в виде ResultSet, который повторно сортируется
+    и фильтруется без нового запроса.
+    Результат не кешируется, если во время его получения API был недоступен (circuit breaker не closed
+    или отклонил запрос): в нем могут отсутствовать страницы, которые не удалось запросить.
+    Raises:
+        CircuitOpenError: API недоступен и результата нет в хранилище, такой результат не кешируется.
+    """
+    found, result = _result_cache.get(key)
+    if found:
+        return result
+    rejected: int = circuit_breaker.get_state()['rejected']
+    result: List[Product] = single_flight.do(key, func, *args)
+    logger.debug(f'Объединение запросов к API: {get_coalesced_stats()}')
+    if not result and not circuit_breaker.is_closed():
+        raise CircuitOpenError(key)
+    if result is not None:
+        result = ResultSet(result)
+    if circuit_breaker.is_closed() and circuit_breaker.get_state()['rejected'] == rejected:
+        _result_cache.put(key, result)
+    return result
+
+
+def main(method: str, product: str, **kwargs) -> ResultSet | None:
     """
     Функция обрабатывает запросы по типу методов API и параметров запросов пользователя.
 
@@ -26,12 +164,57 @@ def main(method: str, product: str, **kwargs) -> List[Product]:
             Описание доставки (str).
             Название магазина (str).
             Cсылка на предоставленный товар (str).
+        Все параметры запроса приводятся к каноническому ключу RequestKey (метод, товар, страна, язык, страница),
+        по которому работают кеш в памяти и файлы кеша, поэтому разные страницы одного товара не пересекаются.
+        Одновременные вызовы с одинаковым ключом объединяются: запрос к API выполняет первый вызов,
+        остальные ожидают и получают его результат. Счетчики доступны в get_coalesced_stats().
+        Результаты в памяти хранятся в ResultCache (ограничение объема Setting.get_result_cache_max_bytes(),
+        допуск по частоте запросов) не дольше Setting.get_result_cache_ttl(), пустые результаты не дольше
+        Setting.get_result_cache_negative_ttl(). Затем результат читается из хранилища, которое возвращает
+        устаревший результат сразу и обновляет его в фоне. Счетчики доступны в get_result_cache_stats(),
+        результат можно удалить из памяти с помощью invalidate_search().
+        Если API недоступен (circuit breaker), результат выдается только из кеша, без ожидания ответа API.
+        Для ключа текст запроса приводится к каноническому виду (query_normalizer): регистр, пробелы,
+        знаки препинания, ё/е, синонимы и транслитерация, поэтому "Iphone 15" и "айфон 15" используют один
+        результат. Счетчики доступны в get_query_stats(). API получает текст пользователя без пробелов по краям
+        в нижнем регистре, а не канонический текст.
 
     Returns:
 
-         List[Product] : В случае удачного запроса List[Product].
+         ResultSet : В случае удачного запроса список товаров (ResultSet).
 
          None: в случае не удачного None.
     """
-    result: List[Product] = request_product(method, product, **kwargs)
-    return result
+    key: RequestKey = build_request_key(method, query_normalizer.normalize(product), **kwargs)
+    try:
+        result: ResultSet | None = _cached(key, request_product, key, product.strip().lower())
+        if result:
+            query_normalizer.remember(key.product)
+        return result
+    except CircuitOpenError as err:
+        logger.warning(f'API недоступен, результата нет в кеше: {err}; {get_circuit_state()}')
+
+
+def main_pages(method: str, product: str, pages: Iterable[int], **kwargs) -> ResultSet:
+    """
+    Функция подобна main(), но одновременно запрашивает несколько страниц результатов.
+    Каждая страница кешируется по своему ключу, одновременные одинаковые вызовы объединяются в один запрос.
+
+    Params:
+        method (str): Типы запросов к API
+        product (str): Название товара.
+        pages (Iterable[int]): Номера страниц.
+
+    Returns:
+         ResultSet : Объединенный список товаров со всех страниц, в случае неудачи пустой список.
+    """
+    query: str = query_normalizer.normalize(product)
+    try:
+        keys: Tuple[RequestKey, ...] = tuple(build_request_key(method, query, page=page, **kwargs) for page in pages)
+        result: ResultSet = _cached(keys, request_product_pages, keys, product.strip().lower())
+        if result:
+            query_normalizer.remember(query)
+        return result
+    except CircuitOpenError as err:
+        logger.warning(f'API недоступен, результатов нет в кеше: {err}; {get_circuit_state()}')
+        return ResultSet()
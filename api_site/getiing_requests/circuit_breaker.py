@@ -0,0 +1,105 @@
+import threading
+from time import monotonic
+from typing import Dict
+
+from common_utils.config import Setting
+from common_utils.config_log import logger
+
+
+class CircuitOpenError(Exception):
+    """Исключение возникает, когда API недоступен и запросы к нему временно не выполняются."""
+
+
+class CircuitBreaker:
+    """
+    Класс отслеживает доступность API и временно прекращает запросы к нему после серии ошибок.
+
+    Methods:
+        allow_request(): Возвращает True, если запрос к API можно выполнить.
+        record_success(): Отмечает успешный ответ API.
+        record_failure(): Отмечает ошибку (таймаут, ошибка соединения, ответ 5xx).
+        is_closed(): Возвращает True, если API считается доступным.
+        get_state(): Возвращает состояние и счетчики.
+
+    Notes:
+        closed - запросы выполняются. После failure_threshold ошибок подряд состояние меняется на open.
+        open - запросы сразу отклоняются, результаты выдаются только из кеша.
+        Через reset_timeout секунд состояние меняется на half_open и выполняется один пробный запрос:
+        в случае успеха состояние снова closed, в случае ошибки снова open.
+    """
+    CLOSED: str = 'closed'
+    OPEN: str = 'open'
+    HALF_OPEN: str = 'half_open'
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.__failure_threshold: int = failure_threshold
+        self.__reset_timeout: float = reset_timeout
+        self.__lock: threading.Lock = threading.Lock()
+        self.__state: str = self.CLOSED
+        self.__failures: int = 0
+        self.__opened_at: float = 0.0
+        self.__probe_in_flight: bool = False
+        self.__probe_started: float = 0.0
+        self.__rejected: int = 0
+        self.__trips: int = 0
+
+    def __set_state(self, state: str) -> None:
+        """Метод меняет состояние и записывает изменение в журнал."""
+        if state != self.__state:
+            log = logger.warning if state == self.OPEN else logger.info
+            log(f'Circuit breaker API: {self.__state} -> {state}, ошибок подряд: {self.__failures}')
+            self.__state = state
+
+    def allow_request(self) -> bool:
+        """Метод возвращает True, если запрос к API можно выполнить."""
+        with self.__lock:
+            if self.__state == self.OPEN and monotonic() - self.__opened_at >= self.__reset_timeout:
+                self.__set_state(self.HALF_OPEN)
+            if self.__state == self.CLOSED:
+                return True
+            if self.__state == self.HALF_OPEN and (not self.__probe_in_flight
+                                                   or monotonic() - self.__probe_started >= self.__reset_timeout):
+                self.__probe_in_flight = True  # пробный запрос, который не завершился, будет повторен.
+                self.__probe_started = monotonic()
+                return True
+            self.__rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Метод отмечает успешный ответ API."""
+        with self.__lock:
+            self.__failures = 0
+            self.__probe_in_flight = False
+            self.__set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """Метод отмечает ошибку запроса к API."""
+        with self.__lock:
+            self.__failures += 1
+            self.__probe_in_flight = False
+            if self.__state == self.HALF_OPEN or self.__failures >= self.__failure_threshold:
+                if self.__state != self.OPEN:
+                    self.__trips += 1
+                self.__opened_at = monotonic()
+                self.__set_state(self.OPEN)
+
+    def is_closed(self) -> bool:
+        """Метод возвращает True, если API считается доступным."""
+        with self.__lock:
+            return self.__state == self.CLOSED
+
+    def get_state(self) -> Dict:
+        """
+        Метод возвращает состояние.
+        Returns:
+            Dict: state, failures - ошибок подряд, rejected - отклоненные запросы,
+                trips - кол-во переходов в open, opened_for - сколько секунд API считается недоступным.
+        """
+        with self.__lock:
+            opened_for: float = monotonic() - self.__opened_at if self.__state != self.CLOSED else 0.0
+            return {'state': self.__state, 'failures': self.__failures, 'rejected': self.__rejected,
+                    'trips': self.__trips, 'opened_for': round(opened_for, 2)}
+
+
+circuit_breaker: CircuitBreaker = CircuitBreaker(Setting.get_circuit_failure_threshold(),
+                                                 Setting.get_circuit_reset_timeout())
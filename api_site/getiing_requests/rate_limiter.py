@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from time import monotonic, time
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from common_utils.config import Setting
+from common_utils.config_log import logger
+
+PRIORITY_INTERACTIVE: int = 0  # запросы пользователей.
+PRIORITY_BACKGROUND: int = 1  # фоновые обновления и прогрев кеша.
+
+_priority: ContextVar[int] = ContextVar('request_priority', default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    Контекстный менеджер задает приоритет запросов к API, выполняемых внутри блока.
+    Params:
+        priority (int): PRIORITY_INTERACTIVE | PRIORITY_BACKGROUND.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateLimiter:
+    """
+    Класс ограничивает частоту запросов к API (token bucket) для всего процесса.
+
+    Methods:
+        acquire(timeout): Ожидает разрешение на запрос с учетом приоритета.
+        update_from_headers(status_code, headers): Учитывает заголовки лимитов и Retry-After ответа API.
+        get_budget(): Возвращает текущее состояние лимитов.
+
+    Notes:
+        Запросы ожидают в очереди по приоритету: запросы пользователей выполняются раньше фоновых.
+        Ответ 429 и заголовок Retry-After приостанавливают все запросы на указанное время.
+        Когда остаток квоты тарифа (X-RateLimit-Requests-Remaining) опускается до резерва
+        Setting.get_rate_limit_reserve(), фоновые запросы не выполняются, квота остается пользователям.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.__rate: float = rate
+        self.__burst: int = burst
+        self.__tokens: float = burst
+        self.__updated: float = monotonic()
+        self.__paused_until: float = 0.0
+        self.__quota_limit: Optional[int] = None
+        self.__quota_remaining: Optional[int] = None
+        self.__condition: threading.Condition = threading.Condition()
+        self.__queue: List[Tuple[int, int]] = []
+        self.__counter = itertools.count()
+
+    def __refill(self, now: float) -> None:
+        """Метод пополняет запас токенов за прошедшее время."""
+        self.__tokens = min(self.__burst, self.__tokens + (now - self.__updated) * self.__rate)
+        self.__updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Метод ожидает разрешение на один запрос к API. Приоритет задается request_priority().
+        Params:
+            timeout (float | None): Максимальное время ожидания в секундах, None - без ограничения.
+        Returns:
+            bool: True, если запрос разрешен, False если время ожидания истекло или квота зарезервирована.
+        """
+        priority: int = _priority.get()
+        ticket: Tuple[int, int] = (priority, next(self.__counter))
+        deadline: Optional[float] = None if timeout is None else monotonic() + timeout
+        with self.__condition:
+            if (priority != PRIORITY_INTERACTIVE and self.__quota_remaining is not None
+                    and self.__quota_remaining <= Setting.get_rate_limit_reserve()):
+                return False
+            heapq.heappush(self.__queue, ticket)
+            try:
+                while True:
+                    now: float = monotonic()
+                    self.__refill(now)
+                    if self.__queue[0] == ticket and now >= self.__paused_until and self.__tokens >= 1:
+                        self.__tokens -= 1
+                        return True
+                    if self.__queue[0] == ticket:
+                        wait: float = max(self.__paused_until - now, (1 - self.__tokens) / self.__rate)
+                    else:
+                        wait: float = 1 / self.__rate
+                    if deadline is not None:
+                        if now >= deadline:
+                            return False
+                        wait = min(wait, deadline - now)
+                    self.__condition.wait(wait)
+            finally:
+                self.__queue.remove(ticket)
+                heapq.heapify(self.__queue)
+                self.__condition.notify_all()
+
+    def update_from_headers(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Метод учитывает лимиты, которые сообщил API.
+        Params:
+            status_code (int): Код ответа.
+            headers (Mapping): Заголовки ответа (X-RateLimit-Requests-*, Retry-After).
+        """
+        with self.__condition:
+            limit: Optional[str] = headers.get('X-RateLimit-Requests-Limit')
+            remaining: Optional[str] = headers.get('X-RateLimit-Requests-Remaining')
+            if limit and limit.isdigit():
+                self.__quota_limit = int(limit)
+            if remaining and remaining.isdigit():
+                self.__quota_remaining = int(remaining)
+
+            pause: float = 0.0
+            if status_code == 429:
+                pause = self.__parse_retry_after(headers.get('Retry-After'))
+            elif self.__quota_remaining == 0:
+                reset: Optional[str] = headers.get('X-RateLimit-Requests-Reset')
+                pause = float(reset) if reset and reset.isdigit() else 0.0
+            if pause:
+                self.__paused_until = max(self.__paused_until, monotonic() + pause)
+                self.__tokens = 0
+                logger.warning(f'Запросы к API приостановлены на {pause} сек. {status_code=}')
+            self.__condition.notify_all()
+
+    @staticmethod
+    def __parse_retry_after(value: Optional[str]) -> float:
+        """Метод возвращает паузу из заголовка Retry-After (секунды или дата), по умолчанию одна секунда."""
+        if not value:
+            return 1.0
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+        except (TypeError, ValueError):
+            return 1.0
+
+    def get_budget(self) -> Dict:
+        """
+        Метод возвращает состояние лимитов.
+        Returns:
+            Dict: tokens - доступные запросы, rate - запросов в секунду, paused_for - оставшаяся пауза (сек.),
+                quota_limit, quota_remaining - квота тарифа по заголовкам API, queued - запросы в очереди.
+        """
+        with self.__condition:
+            now: float = monotonic()
+            self.__refill(now)
+            return {'tokens': round(self.__tokens, 2), 'rate': self.__rate,
+                    'paused_for': round(max(0.0, self.__paused_until - now), 2),
+                    'quota_limit': self.__quota_limit, 'quota_remaining': self.__quota_remaining,
+                    'queued': len(self.__queue)}
+
+
+rate_limiter: RateLimiter = RateLimiter(Setting.get_rate_limit_rps(), Setting.get_rate_limit_burst())
@@ -1,7 +1,11 @@
-from typing import TypeVar, Dict, Optional
+from typing import TypeVar, Dict
 from time import sleep
 import requests
 from api_site.config_get_requests.configs_base import ConfigsAPI
+from api_site.getiing_requests.session_http import SessionHTTP
+from api_site.getiing_requests.rate_limiter import rate_limiter
+from api_site.getiing_requests.circuit_breaker import circuit_breaker
+from common_utils.config import Setting
 from common_utils.config_log import logger
 
 T = TypeVar('T')
@@ -30,28 +34,45 @@ class ResponseAPISite:
     def get_requests(self) -> requests.Response | None:
         """
         Метод возвращает Response object  извлекая данные из конструктора.
+        Запрос выполняется через общую сессию SessionHTTP с таймаутами соединения и чтения.
+        Перед каждой попыткой запрос ожидает разрешение общего ограничителя rate_limiter,
+        который учитывает квоту API, ответы 429 и заголовок Retry-After.
+        Если circuit_breaker считает API недоступным, запрос сразу завершается без ожидания и повторов.
+        В случае неудачи запрос повторяется Setting.get_http_max_retries() раз с паузой SessionHTTP.get_backoff().
         Returns:
              The Response object | None
         """
-        response = Optional[None]
-        try:
-            trying: int = 0
-            while trying != 2:
-                with requests.get(url=self._url, headers=self._headers, params=self._param) as response:
+        max_retries: int = Setting.get_http_max_retries()
+        for trying in range(max_retries):
+            if not circuit_breaker.allow_request():
+                logger.debug(f"Запрос к API не выполнен, API недоступен: url = {self._url}; param = {self._param}; "
+                             f"{circuit_breaker.get_state()}")
+                return None
+            if not rate_limiter.acquire(timeout=Setting.get_rate_limit_wait()):
+                logger.warning(f"Запрос к API не выполнен из-за лимита запросов: url = {self._url}; "
+                               f"param = {self._param}; {rate_limiter.get_budget()}")
+                return None
+            try:
+                with SessionHTTP.get(url=self._url, headers=self._headers, params=self._param) as response:
+                    rate_limiter.update_from_headers(response.status_code, response.headers)
+                    if response.status_code >= 500:
+                        circuit_breaker.record_failure()
+                    else:
+                        circuit_breaker.record_success()
                     if response.status_code == 200:
                         return response
-                    else:
-                        logger.debug(f"Неудачная попытка запроса request_model.py.ResponseAPISite\n\t"
-                                     f"{response.status_code=}")
-                        trying += 1
-                        sleep(trying * 2)
+                    logger.debug(f"Неудачная попытка запроса request_model.py.ResponseAPISite\n\t"
+                                 f"{response.status_code=}")
+                    if response.status_code == 429:  # паузу до следующей попытки задает rate_limiter.
                         continue
-            else:
-                response.close()
-                raise TimeoutError(response.status_code)
-        except TimeoutError as er:
-            logger.error(f"pi_site/getting_requests/request_model.py"
-                         f"\n\tНет ответа от сервера: url = {self._url};"
-                         f"\n\t\tparam = {self._param};"
-                         f"\n\t\ter = {er}\n")
-            return response
+            except requests.RequestException as er:
+                circuit_breaker.record_failure()
+                logger.debug(f"Неудачная попытка запроса request_model.py.ResponseAPISite\n\t{er=}")
+            if trying < max_retries - 1:
+                sleep(SessionHTTP.get_backoff(trying))
+
+        logger.error(f"api_site/getting_requests/request_model.py"
+                     f"\n\tНет ответа от сервера: url = {self._url};"
+                     f"\n\t\tparam = {self._param};"
+                     f"\n\t\tпопыток = {max_retries}\n")
+        return None
@@ -0,0 +1,68 @@
+import random
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common_utils.config import Setting
+
+
+class SessionHTTP:
+    """
+    Класс предоставляет общую HTTP сессию с пулом keep-alive соединений для всех исходящих запросов.
+
+    Attributes:
+        __session (requests.Session): Сессия, которая создается при первом обращении и переиспользуется всеми потоками.
+        __lock (threading.Lock): Блокировка для безопасного создания сессии из разных потоков.
+
+    Methods:
+        get_session(): Возвращает общую сессию.
+        get(url, **kwargs): Выполняет GET запрос через общую сессию с таймаутами по умолчанию.
+        get_backoff(trying): Возвращает паузу перед следующей попыткой запроса.
+
+    Notes:
+        Повторное использование соединений избавляет каждый запрос от нового TCP+TLS рукопожатия.
+        Повторные попытки на уровне адаптера отключены, их выполняет ResponseAPISite.
+    """
+    __session: Optional[requests.Session] = None
+    __lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Метод возвращает общую сессию, при первом обращении сессия будет создана."""
+        if cls.__session is None:
+            with cls.__lock:
+                if cls.__session is None:
+                    pool_size: int = Setting.get_http_pool_size()
+                    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+                    session = requests.Session()
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    cls.__session = session
+        return cls.__session
+
+    @classmethod
+    def get(cls, url: str, **kwargs) -> requests.Response:
+        """
+        Метод выполняет GET запрос через общую сессию.
+        Params:
+            url (str): Адрес запроса.
+            **kwargs: Параметры requests (headers, params, timeout ...).
+        Returns:
+            requests.Response
+        Raises:
+            requests.RequestException: Ошибки соединения и превышения таймаутов.
+        """
+        kwargs.setdefault('timeout', Setting.get_http_timeout())
+        return cls.get_session().get(url, **kwargs)
+
+    @staticmethod
+    def get_backoff(trying: int) -> float:
+        """
+        Метод возвращает паузу (в секундах) перед повторной попыткой.
+        Пауза растет экспоненциально, ограничена сверху и случайно распределена (full jitter),
+        что бы одновременные запросы не повторялись в один момент.
+        """
+        base, cap = Setting.get_http_backoff()
+        return random.uniform(0, min(cap, base * 2 ** trying))
@@ -0,0 +1,25 @@
+import asyncio
+from typing import Callable, Iterable, List, TypeVar
+from api_site.utils.request_key import RequestKey
+from api_site.utils.single_flight import single_flight
+
+
+T = TypeVar('T')
+
+
+async def request_api_pages(fetch: Callable[..., T], keys: Iterable[RequestKey], *args) -> List[T | BaseException]:
+    """
+    Корутина одновременно запрашивает несколько страниц результатов.
+    Args:
+        fetch (Callable) : Функция запроса одной страницы по ключу (request_product).
+        keys (Iterable[RequestKey]) : Канонические ключи запросов страниц.
+        *args : Остальные аргументы fetch, передаются после ключа.
+    Returns:
+        List: Результаты fetch в порядке ключей, на месте запросов, завершившихся ошибкой, исключение.
+    Notes:
+        Каждая страница запрашивается в отдельном потоке через single_flight по ключу страницы,
+        поэтому страница, которую в это же время запрашивает main() или другой набор страниц,
+        запрашивается у API один раз.
+    """
+    return await asyncio.gather(*(asyncio.to_thread(single_flight.do, key, fetch, key, *args) for key in keys),
+                                return_exceptions=True)
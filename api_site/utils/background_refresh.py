@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Set
+
+from api_site.getiing_requests.rate_limiter import request_priority, PRIORITY_BACKGROUND
+from common_utils.config_log import logger
+
+
+class BackgroundRefresher:
+    """
+    Класс выполняет обновление устаревших результатов в фоновых потоках.
+
+    Methods:
+        schedule(key, func, *args, **kwargs): Ставит обновление в очередь, если по данному ключу
+            обновление еще не выполняется.
+
+    Notes:
+        Пользователь получает устаревший результат сразу, а новый результат заменит его в хранилище
+        после завершения фонового запроса (stale-while-revalidate). Запросы к API из фоновых потоков
+        выполняются после запросов пользователей (PRIORITY_BACKGROUND).
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers,
+                                                                 thread_name_prefix='refresh')
+        self.__lock: threading.Lock = threading.Lock()
+        self.__in_progress: Set[Hashable] = set()
+
+    def schedule(self, key: Hashable, func: Callable, *args, **kwargs) -> bool:
+        """
+        Метод ставит обновление в очередь.
+        Returns:
+            bool: True, если обновление поставлено в очередь, False если по ключу обновление уже выполняется.
+        """
+        with self.__lock:
+            if key in self.__in_progress:
+                return False
+            self.__in_progress.add(key)
+        self.__executor.submit(self.__run, key, func, *args, **kwargs)
+        return True
+
+    def __run(self, key: Hashable, func: Callable, *args, **kwargs) -> None:
+        """Метод выполняет обновление с фоновым приоритетом запросов к API и снимает отметку о выполнении."""
+        try:
+            with request_priority(PRIORITY_BACKGROUND):
+                func(*args, **kwargs)
+        except Exception as err:
+            logger.error(f'api_site/utils/background_refresh.py Не удалось обновить результат {key=}: {err=}')
+        finally:
+            with self.__lock:
+                self.__in_progress.discard(key)
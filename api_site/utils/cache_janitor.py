@@ -0,0 +1,51 @@
+import threading
+
+from api_site.utils.result_store import ResultStore
+from common_utils.config import Setting
+from common_utils.config_log import logger
+
+
+class CacheJanitor(threading.Thread):
+    """
+    Фоновый поток, который поддерживает хранилище результатов в пределах лимитов.
+
+    Methods:
+        run(): Периодически вызывает ResultStore.evict(), при необходимости ResultStore.compact(),
+            и записывает метрики в журнал.
+        stop(): Останавливает поток.
+
+    Notes:
+        Лимиты (кол-во результатов и суммарный размер) проверяются каждые Setting.get_cache_evict_interval()
+        секунд. За один проход удаляется не более Setting.get_cache_evict_batch() записей, если лимиты все еще
+        превышены, следующий проход начнется сразу.
+        Удаленные записи не уменьшают файл SQLite, поэтому, когда лимиты больше не превышены, а свободное место
+        в файле не меньше Setting.get_cache_compact_bytes() байт, файл сжимается (compact()).
+    """
+
+    def __init__(self, store: ResultStore) -> None:
+        super().__init__(name='cache_janitor', daemon=True)
+        self.__store: ResultStore = store
+        self.__stop_event: threading.Event = threading.Event()
+
+    def run(self) -> None:
+        """Метод выполняет проверку лимитов хранилища до остановки потока."""
+        while not self.__stop_event.is_set():
+            removed: int = 0
+            try:
+                removed = self.__store.evict(max_count=Setting.get_cache_max_entries(),
+                                             max_bytes=Setting.get_cache_max_bytes(),
+                                             batch=Setting.get_cache_evict_batch())
+                if removed:
+                    logger.info(f'Из хранилища результатов удалено записей: {removed}. '
+                                f'Метрики: {self.__store.get_stats()}')
+                if (removed < Setting.get_cache_evict_batch()
+                        and self.__store.compact(min_free_bytes=Setting.get_cache_compact_bytes())):
+                    logger.info(f'Хранилище результатов сжато. Метрики: {self.__store.get_stats()}')
+            except Exception as err:
+                logger.error(f'api_site/utils/cache_janitor.py Не удалось очистить хранилище результатов: {err=}')
+            if removed < Setting.get_cache_evict_batch():
+                self.__stop_event.wait(Setting.get_cache_evict_interval())
+
+    def stop(self) -> None:
+        """Метод останавливает поток."""
+        self.__stop_event.set()
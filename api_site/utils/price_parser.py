@@ -0,0 +1,110 @@
+import re
+from typing import Dict, NamedTuple, Optional, Pattern, Tuple
+
+# Частые формы цены ("1 234 ₽", "1 299,00 руб.", "1234.56"): целая часть без разделителей или с пробелами между
+# группами по три цифры, не более двух цифр дробной части и необязательная валюта после числа.
+_SIMPLE_PRICE: Pattern = re.compile(r'(\d{1,3}(?:[ \u00a0\u202f]\d{3})+|\d+)(?:[.,](\d\d?))?'
+                                    r'(?:[ \u00a0]?([₽$€£¥₸₴]|руб|р)\.?)?')
+
+# Число с разделителями разрядов (пробелы, точка, запятая, апостроф) и дробной части.
+_NUMBER: Pattern = re.compile(r"\d(?:[\d\s.,']*\d)?")
+
+# Символ валюты или код валюты отдельным словом в тексте рядом с числом ("US$", "от 990 руб.").
+_CURRENCY: Pattern = re.compile(r'[₽$€£¥₸₴]|\b(?:руб|р|rub|usd|eur|gbp|cny|kzt|byn|uah)\b')
+
+# Таблица str.translate, удаляющая разделители разрядов (пробелы, табуляция, апостроф). Таблица - кортеж по кодам
+# символов до U+2030: символы за его пределами (₽, €) не меняются, а поиск по кортежу быстрее, чем по словарю.
+_GROUP_SPACES: Tuple[Optional[int], ...] = tuple(None if char in ' \u00a0\u202f\u2009\t\'' else code
+                                                 for code, char in enumerate(map(chr, range(0x2030))))
+
+_CURRENCY_CODES: Dict[str, str] = {
+    '₽': 'RUB', 'руб': 'RUB', 'р': 'RUB', 'rub': 'RUB', '$': 'USD', 'usd': 'USD',
+    '€': 'EUR', 'eur': 'EUR', '£': 'GBP', 'gbp': 'GBP', '¥': 'CNY', 'cny': 'CNY', '₸': 'KZT', 'kzt': 'KZT',
+    'byn': 'BYN', '₴': 'UAH', 'uah': 'UAH',
+}
+
+
+class ParsedPrice(NamedTuple):
+    """
+    Результат разбора строки цены.
+
+    Attributes:
+        amount (float): Стоимость.
+        currency (str | None): Код валюты ISO 4217, None если валюта не указана.
+    """
+    amount: float
+    currency: Optional[str]
+
+
+def _to_float(number: str) -> float:
+    """
+    Функция преобразует число с разделителями разрядов и дробной части в float.
+    Notes:
+        Если есть и точка и запятая, дробную часть отделяет последний из них.
+        Один разделитель, за которым следуют ровно три цифры ("1,299", "1.299"), считается разделителем разрядов,
+        иначе ("1299,00", "12.5") разделителем дробной части. Повторяющийся разделитель - разделитель разрядов.
+    """
+    if number.isdigit():
+        return float(number)
+    number = number.translate(_GROUP_SPACES)
+    comma, dot = number.rfind(','), number.rfind('.')
+    if comma != -1 and dot != -1:
+        decimal: str = ',' if comma > dot else '.'
+        group: str = '.' if decimal == ',' else ','
+        return float(number.replace(group, '').replace(decimal, '.'))
+    separator: str = ',' if comma != -1 else '.' if dot != -1 else ''
+    if not separator:
+        return float(number)
+    integer, _, fraction = number.rpartition(separator)
+    if number.count(separator) > 1 or len(fraction) == 3:
+        return float(number.replace(separator, ''))
+    return float(f'{integer}.{fraction}')
+
+
+def _find_currency(text: str) -> Optional[str]:
+    """
+    Функция возвращает код валюты, указанной в тексте до или после числа ("руб.", "₽", "US$", "EUR").
+    Notes:
+        Обычно текст - это только валюта и она находится по словарю, поиск по тексту (_CURRENCY) выполняется,
+        только если текст содержит что-то еще ("от", "US$").
+    """
+    token: str = text.strip().rstrip('.').lower()
+    code: Optional[str] = _CURRENCY_CODES.get(token)
+    if code is None and token:
+        match = _CURRENCY.search(token)
+        code = None if match is None else _CURRENCY_CODES[match.group()]
+    return code
+
+
+def _parse_text(text: str) -> Optional[ParsedPrice]:
+    """Функция разбирает строку цены, которая не соответствует частым формам (_SIMPLE_PRICE)."""
+    match = _NUMBER.search(text)
+    if match is None:
+        return None
+    try:
+        amount: float = _to_float(match.group())
+    except ValueError:  # разделители не соответствуют ни одному формату ("1.2.3,4,5").
+        return None
+    return ParsedPrice(amount, _find_currency(text[match.end():]) or _find_currency(text[:match.start()]))
+
+
+def parse_price(text: str | int | float | None) -> Optional[ParsedPrice]:
+    """
+    Функция разбирает строку цены ("1 299,00 ₽", "$1,299.00", "1.299 €", "от 990 руб.").
+    Params:
+        text (str | int | float | None): Цена из ответа API.
+    Returns:
+        ParsedPrice | None: Стоимость и код валюты, None если в цене нет числа.
+    """
+    if isinstance(text, str):
+        match = _SIMPLE_PRICE.fullmatch(text)
+        if match is None:
+            return _parse_text(text)
+        integer, fraction, currency = match.groups()
+        if not integer.isdigit():
+            integer = integer.translate(_GROUP_SPACES)
+        return ParsedPrice(float(f'{integer}.{fraction}' if fraction else integer),
+                           _CURRENCY_CODES[currency] if currency else None)
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return ParsedPrice(float(text), None)
+    return None
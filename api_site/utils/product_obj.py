@@ -1,6 +1,7 @@
 from typing import List, Optional
 
-import requests
+from api_site.getiing_requests.session_http import SessionHTTP
+from api_site.utils.price_parser import ParsedPrice, parse_price
 
 
 class Product:
@@ -9,9 +10,11 @@ class Product:
 
     Attribute:
         __list_param (tuple) : Содержит список ключей, ко которым будут извлекаться из json файла различные свойства.
+        __slots__ (tuple) : Свойства товара, объект не содержит __dict__, что уменьшает расход памяти
+            при хранении большого кол-ва результатов.
 
     Methods:
-        _price_edit(price: str) -> float: изменяет тип цены из str в float
+        _price_edit(price: str) -> ParsedPrice: разбирает строку цены (price_parser.parse_price).
         _product_att(attributes: dict) -> str: Получение свойства товара преобразуются в строковое значение.
         get_product_id(self) -> str: Метод возвращает id товара.
         get_store_name(self) -> str: Метод возвращает название магазина.
@@ -19,16 +22,25 @@ class Product:
         get_product_photos(self) -> bytes: Метод возвращает фотографию товара.
         get_product_description(self) -> str: Метод возвращает описание товара.
         get_price(self) -> float: Метод возвращает стоимость товара.
+        get_currency(self) -> str | None: Метод возвращает код валюты цены.
         get_product_rating(self) -> float | str: Метод возвращает  рейтинг товара.
         get_shipping(self) -> str: Метод возвращает описание доставки товара.
         get_offer_page_url(self) -> str: Метод возвращает ссылку на товар.
         get_product_attributes(self) -> str: Метод возвращает характеристики товара.
         get_param_list(cls): Метод возвращает ключи свойственные этому классу.
+        from_record(cls, record): Метод создает объект товара из записи хранилища результатов.
+        get_size_estimate(self) -> int: Метод оценивает объем товара в памяти без разбора цены и характеристик.
 
     Notes:
         Класс предназначен для формирования списка товаров имеющие шаблонные свойства которые
         в последующем будут формировать готовые результаты запроса.
+        Цена и строка характеристик вычисляются при первом обращении (get_price(), get_product_attributes())
+        и запоминаются, поэтому товары, которые пользователь не просматривает, не тратят время на разбор.
     """
+    __slots__ = ('_product_id', '_store_name', '_product_title', '_product_photos', '_product_description',
+                 '_product_rating', '_shipping', '_offer_page_url', '_raw_price', '_raw_attributes',
+                 '_price', '_currency', '_product_attributes')
+
     __list_params: tuple = (
         "product_id", "product_rating", 'product_title', 'product_photos', "product_description",
         "price", "shipping", "offer_page_url", 'store_name', 'product_attributes')
@@ -50,28 +62,25 @@ class Product:
         self._product_title: str = product_title
         self._product_photos: List[str] = product_photos
         self._product_description: str = product_description
-        self._price: float = self._price_edit(price)
         self._product_rating: float | int | Optional[None] = product_rating
         self._shipping: str = shipping
         self._offer_page_url: str = offer_page_url
-        self._product_attributes: str = self._product_att(product_attributes)
+        self._raw_price: str = price
+        self._raw_attributes: dict | None = product_attributes
+        self._price: float | None = None
+        self._currency: str | None = None
+        self._product_attributes: str | None = None
 
     @staticmethod
-    def _price_edit(price: str) -> float:
-        """Метод преобразует str значение во float"""
-        price_new_format: float = float(((''.join(dig for dig in price
-                                                  if dig.isdigit() or dig == ',' or dig == '.'))
-                                         .replace(",", '.')))
-        return price_new_format
+    def _price_edit(price: str) -> ParsedPrice:
+        """Метод разбирает строку цены, если в ней нет числа, стоимость равна 0."""
+        return parse_price(price) or ParsedPrice(0.0, None)
 
     @staticmethod
     def _product_att(attributes: dict) -> str:
         """Метод преобразует Dict значение в str"""
         if attributes:
-            str_: str = ''
-            for params, text in attributes.items():
-                str_ += ''.join(params + ':' + text + '\n')
-            return str_
+            return ''.join(f'{params}:{text}\n' for params, text in attributes.items())
         return 'Информация не доступна.'
 
     def get_product_id(self) -> str:
@@ -95,7 +104,7 @@ class Product:
         Returns:
             bytes: Изображение товара.
         """
-        with requests.get(self._product_photos[0]) as pict:
+        with SessionHTTP.get(self._product_photos[0]) as pict:
             return pict.content
 
     def get_link_photo(self):
@@ -111,8 +120,15 @@ class Product:
 
     def get_price(self) -> float:
         """Метод возвращает стоимость товара."""
+        if self._price is None:
+            self._price, self._currency = self._price_edit(self._raw_price)
         return self._price
 
+    def get_currency(self) -> str | None:
+        """Метод возвращает код валюты цены (ISO 4217), None если валюта не указана."""
+        self.get_price()
+        return self._currency
+
     def get_product_rating(self) -> float | str:
         """Метод возвращает рейтинг товара."""
         if self._product_rating:
@@ -129,6 +145,9 @@ class Product:
 
     def get_product_attributes(self) -> str:
         """Метод возвращает параметры товара."""
+        if self._product_attributes is None:
+            self._product_attributes = self._product_att(self._raw_attributes)
+            self._raw_attributes = None
         if self._product_attributes:
             return self._product_attributes
 
@@ -137,6 +156,27 @@ class Product:
         """Метод возвращает ключи по которым будут формироваться запросы."""
         return cls.__list_params
 
+    @classmethod
+    def from_record(cls, record: tuple | list) -> 'Product':
+        """
+        Метод создает объект товара из записи, значения которой следуют в порядке get_param_list().
+        Используется для чтения результатов из хранилища без обхода исходного ответа API.
+        """
+        return cls(**dict(zip(cls.__list_params, record)))
+
+    def get_size_estimate(self) -> int:
+        """
+        Метод оценивает объем товара в памяти по длине исходных текстовых свойств.
+        Характеристики оцениваются по их кол-ву, поэтому ленивое формирование строки характеристик не выполняется.
+        """
+        size: int = 256
+        for value in (self._product_title, self._product_description, self._shipping, self._offer_page_url,
+                      self._raw_price, self._store_name):
+            if isinstance(value, str):
+                size += len(value)
+        size += sum(len(link) for link in self._product_photos or () if isinstance(link, str))
+        return size + 64 * len(self._raw_attributes or ())
+
     def __repr__(self):
         return f"{self._product_title}"
 
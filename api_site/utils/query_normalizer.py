@@ -0,0 +1,128 @@
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Pattern
+
+from common_utils.config import Setting
+from common_utils.config_log import logger
+
+# Встроенная таблица синонимов и транслитерации, дополняется файлом Setting.get_query_synonyms_path().
+_DEFAULT_SYNONYMS: Dict[str, str] = {
+    'айфон': 'iphone', 'айпад': 'ipad', 'эпл': 'apple', 'эппл': 'apple', 'аирподс': 'airpods',
+    'самсунг': 'samsung', 'галакси': 'galaxy', 'сяоми': 'xiaomi', 'ксиоми': 'xiaomi', 'редми': 'redmi',
+    'хуавей': 'huawei', 'хонор': 'honor', 'реалми': 'realme', 'нокиа': 'nokia', 'леново': 'lenovo',
+    'асус': 'asus', 'макбук': 'macbook', 'плейстейшн': 'playstation', 'сони': 'sony',
+}
+
+_PUNCTUATION: Pattern = re.compile(r'[^\w\s+.]|_')
+_DOT_OUTSIDE_NUMBER: Pattern = re.compile(r'(?<!\d)\.|\.(?!\d)')
+_DECIMAL_COMMA: Pattern = re.compile(r'(?<=\d),(?=\d)')
+
+
+class QueryNormalizer:
+    """
+    Класс приводит текст запроса пользователя к каноническому виду, что бы равнозначные запросы
+    ("Iphone 15", "iphone 15 ", "айфон 15") получали один ключ кеша и один запрос к API.
+
+    Methods:
+        normalize(text): Возвращает канонический текст запроса.
+        remember(query): Запоминает канонический запрос, результат которого есть в кеше.
+        get_stats(): Возвращает счетчики нормализации.
+
+    Notes:
+        Этапы: нижний регистр, ё -> е, запятая внутри числа -> точка ("1,5 л" -> "1.5 л"),
+        знаки препинания -> пробел (кроме "+" и точки внутри числа),
+        лишние пробелы, замена слов и фраз по таблице синонимов.
+        Если включено Setting.get_query_token_match(), запрос с тем же набором слов, что и запомненный
+        (например "15 iphone" и "iphone 15"), заменяется запомненным запросом.
+    """
+
+    def __init__(self, synonyms: Dict[str, str], token_match: bool, max_known: int) -> None:
+        self.__synonyms: Dict[str, str] = {self.__clean(phrase): self.__clean(value)
+                                           for phrase, value in synonyms.items()}
+        self.__pattern: Optional[Pattern] = None
+        if self.__synonyms:
+            phrases = sorted(self.__synonyms, key=len, reverse=True)
+            self.__pattern = re.compile(r'(?<!\w)(' + '|'.join(map(re.escape, phrases)) + r')(?!\w)')
+        self.__token_match: bool = token_match
+        self.__max_known: int = max_known
+        self.__known: OrderedDict[FrozenSet[str], str] = OrderedDict()
+        self.__lock: threading.Lock = threading.Lock()
+        self.__queries: int = 0
+        self.__rewritten: int = 0
+        self.__token_set_matches: int = 0
+
+    @staticmethod
+    def __clean(text: str) -> str:
+        """Метод выполняет нормализацию без таблицы синонимов."""
+        text = _DECIMAL_COMMA.sub('.', str(text).lower().replace('ё', 'е'))
+        text = _DOT_OUTSIDE_NUMBER.sub(' ', _PUNCTUATION.sub(' ', text))
+        return ' '.join(text.split())
+
+    def normalize(self, text: str, track: bool = True) -> str:
+        """
+        Метод возвращает канонический текст запроса.
+        Params:
+            text (str): Текст запроса пользователя.
+            track (bool): Учитывать ли запрос в счетчиках get_stats().
+        Returns:
+            str: Канонический текст запроса.
+        """
+        simple: str = ' '.join(str(text).split()).lower()
+        query: str = self.__clean(text)
+        if self.__pattern is not None:
+            query = self.__pattern.sub(lambda match: self.__synonyms[match.group(1)], query)
+        with self.__lock:
+            matched: bool = False
+            if self.__token_match:
+                known: Optional[str] = self.__known.get(frozenset(query.split()))
+                if known is not None and known != query:
+                    matched, query = True, known
+            if track:
+                self.__queries += 1
+                self.__token_set_matches += matched
+                self.__rewritten += query != simple
+        return query
+
+    def remember(self, query: str) -> None:
+        """
+        Метод запоминает канонический запрос, результат которого есть в кеше,
+        для сопоставления по набору слов.
+        """
+        if not self.__token_match or not query:
+            return
+        tokens: FrozenSet[str] = frozenset(query.split())
+        with self.__lock:
+            self.__known.setdefault(tokens, query)
+            self.__known.move_to_end(tokens)
+            while len(self.__known) > self.__max_known:
+                self.__known.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Метод возвращает счетчики нормализации.
+        Returns:
+            Dict: queries - всего запросов, rewritten - запросы, которые без нормализации получили бы
+                отдельный ключ кеша, token_set_matches - из них совпавшие по набору слов, known - запомненные запросы.
+        """
+        with self.__lock:
+            return {'queries': self.__queries, 'rewritten': self.__rewritten,
+                    'token_set_matches': self.__token_set_matches, 'known': len(self.__known)}
+
+
+def _load_synonyms(path: Optional[str]) -> Dict[str, str]:
+    """Функция возвращает встроенную таблицу синонимов, дополненную таблицей из json файла."""
+    synonyms: Dict[str, str] = dict(_DEFAULT_SYNONYMS)
+    if path:
+        try:
+            with open(path, 'r', encoding='UTF-8') as file:
+                synonyms.update(json.load(file))
+        except (OSError, ValueError) as err:
+            logger.error(f'api_site/utils/query_normalizer.py Не удалось прочитать таблицу синонимов {path}: {err=}')
+    return synonyms
+
+
+query_normalizer: QueryNormalizer = QueryNormalizer(_load_synonyms(Setting.get_query_synonyms_path()),
+                                                    Setting.get_query_token_match(),
+                                                    Setting.get_query_known_max())
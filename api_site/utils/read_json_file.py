@@ -1,44 +1,126 @@
-from typing import List, TypeVar, Dict, Any
+from collections import deque
+from typing import List, Any, Callable, Dict, Hashable, Iterable, Tuple
 from common_utils.config_log import logger
 
-T = TypeVar('T')
+Path = Tuple[str, ...]
 
+_MAX_DEPTH: int = 3  # глубина поиска полей товара во вложенных словарях.
+_MAX_SAMPLE: int = 5  # кол-во товаров, по которым определяется расположение полей.
+_MAX_PLANS: int = 64  # кол-во запоминаемых схем ответов.
+_plans: Dict[Hashable, Tuple[Path | None, ...]] = {}
 
-def create_data_collection(data: dict, list_param: tuple, model_product: T) -> List[T] | None:
+
+def _schema_signature(item: dict, list_param: tuple) -> Hashable:
+    """
+    Функция возвращает схему товара: ключи верхнего уровня и ключи вложенных словарей, в которых есть поля товара.
+    Ключи остальных вложенных словарей (например, характеристик товара) в схему не входят.
+    """
+    return tuple((key, tuple(value) if isinstance(value, dict) and not value.keys().isdisjoint(list_param)
+                  else isinstance(value, dict)) for key, value in item.items())
+
+
+def _find_paths(item: dict, key: str) -> List[Path]:
+    """
+    Функция возвращает пути к ключу key в товаре: сначала верхний уровень, затем вложенные словари
+    (обход в ширину).
+    """
+    paths: List[Path] = []
+    queue: deque = deque([((), item)])
+    while queue:
+        path, node = queue.popleft()
+        if key in node:
+            paths.append(path + (key,))
+        if len(path) + 1 < _MAX_DEPTH:
+            queue.extend((path + (name,), value) for name, value in node.items() if isinstance(value, dict))
+    return paths
+
+
+def _get_path(item: dict, path: Path) -> Any:
+    """Функция возвращает значение по пути, None если промежуточного ключа нет."""
+    for key in path[:-1]:
+        item = item.get(key)
+        if item is None:
+            return None
+    return item.get(path[-1])
+
+
+def _compile_plan(sample: List[dict], list_param: tuple) -> Tuple[Path | None, ...]:
     """
-    Функция возвращает коллекцию объектов наименования товаров.
+    Функция определяет путь к каждому полю товара по нескольким товарам ответа.
+    Выбирается первый путь (ближайший к верхнему уровню), значение по которому не None хотя бы в одном товаре.
+    """
+    plan: List[Path | None] = []
+    for key_param in list_param:
+        paths: List[Path] = []
+        for item in sample:
+            paths.extend(path for path in _find_paths(item, key_param) if path not in paths)
+        filled: List[Path] = [path for path in paths if any(_get_path(item, path) is not None for item in sample)]
+        plan.append((filled or paths or [None])[0])
+    return tuple(plan)
+
+
+def _compile_getter(path: Path | None) -> Callable[[dict], Any]:
+    """Функция возвращает функцию извлечения значения по пути."""
+    if path is None:
+        return lambda item: None
+    if len(path) == 1:
+        key: str = path[0]
+        return lambda item: item[key] if key in item else None
+    return lambda item: _get_path(item, path)
+
+
+def get_plan(data: list, list_param: tuple) -> Tuple[Path | None, ...]:
+    """
+    Функция возвращает пути к полям товаров для схемы ответа. План вычисляется один раз для схемы
+    (по первому товару) и запоминается.
+    """
+    sample: List[dict] = [item for item in data[:_MAX_SAMPLE] if isinstance(item, dict)]
+    if not sample:
+        return tuple(None for _ in list_param)
+    signature: Hashable = (list_param, _schema_signature(sample[0], list_param))
+    plan: Tuple[Path | None, ...] | None = _plans.get(signature)
+    if plan is None:
+        plan = _compile_plan(sample, list_param)
+        if len(_plans) >= _MAX_PLANS:
+            _plans.clear()
+        _plans[signature] = plan
+        logger.debug(f'api_site/utils/read_json_file.py Новая схема ответа API: {dict(zip(list_param, plan))}')
+    return plan
+
+
+def create_records(data: list, list_param: tuple, required: Iterable[str] = ()) -> List[tuple]:
+    """
+    Функция извлекает из ответа API только необходимые поля товаров.
     Params:
-        data (dict): Словарь содержит перечень наименований товаров.
+        data (list): Список товаров из ответа API.
         list_param (tuple): Содержит список ключей, по которым будут извлекаться данные.
-        model_product (T) : Содержит класс по которому будут формироваться объекты товаров.
+        required (Iterable[str]): Ключи, без значений которых товар пропускается.
     Returns:
-        List[T]: Возвращает список объектов наименования найденных товаров.
+        List[tuple]: Записи товаров, значения в которых следуют в порядке list_param.
     Raise:
-        TypeError: Возникает, если в model_product был не верно определен list_param.
-        В случае возникновения ошибки возвращен будет пустой список.
+        TypeError: Возникает, если data не является списком.
     Notes:
-          Функция формирует список объектов (model_product) по предварительно переданным ключам (list_param).
-          Формируется словарь, извлекаются все необходимые параметры и затем распаковываются в model_product,
-          из которых в свою очередь формируется список объектов.
-    """
-    try:
-        list_variable_products: List = []  # Пустой список для новой коллекции товаров.
-        for data_product in data:
-            dict_params: Dict = {}
-            for key_param in list_param:  # извлекаются параметры для объекта - товара.
-                value: Any = data_product.get(key_param)
-                if value:
-                    dict_params[key_param] = value
-                else:
-                    # TODO можно улучшить до рекурсивного поиска ключей.
-                    value: Any = data_product["offer"].get(key_param)
-                    dict_params[key_param] = value
-            list_variable_products.append(model_product(**dict_params))  # распаковываем данные в новый объект.
-
-        return list_variable_products
-    except TypeError as err:
-        logger.error(f"api_site/utils/read_json_file.py,\n\t"
-                     "Необходимо проверить параметры которые передает list_param.\n\t"
-                     "Так же проверить типы данных, которые передаются в  model_product.__init__\n\t"
-                     f"{err=}")
-        return []  # в случае неудачного запроса будет возвращен пустой список.
+        Расположение каждого поля (верхний уровень товара, "offer" или глубже) определяется один раз
+        для схемы ответа (get_plan()), затем план применяется ко всем товарам. Значения 0 и пустые
+        значения сохраняются как есть. Товар с некорректной структурой пропускается, остальные товары
+        ответа сохраняются.
+    """
+    if not isinstance(data, list):
+        raise TypeError(f'Ожидался список товаров, получен {type(data).__name__}')
+    getters: Tuple[Callable[[dict], Any], ...] = tuple(map(_compile_getter, get_plan(data, list_param)))
+    required_index: Tuple[int, ...] = tuple(list_param.index(key) for key in required)
+    list_records: List[tuple] = []
+    skipped: int = 0
+    for data_product in data:
+        try:
+            record: tuple = tuple(getter(data_product) for getter in getters)
+        except (TypeError, AttributeError):  # товар не является словарем или вложенное поле не словарь.
+            skipped += 1
+            continue
+        if any(record[i] is None for i in required_index):
+            skipped += 1
+            continue
+        list_records.append(record)
+    if skipped:
+        logger.warning(f'api_site/utils/read_json_file.py Пропущено некорректных товаров: {skipped} из {len(data)}')
+    return list_records
@@ -0,0 +1,41 @@
+import json
+import zlib
+from typing import List
+
+from common_utils.config import Setting
+
+# Первый байт сохраненного результата определяет его формат.
+_FORMAT_JSON: bytes = b'j'
+_FORMAT_ZLIB: bytes = b'z'
+
+
+def encode_records(records: List[tuple]) -> bytes:
+    """
+    Функция преобразует записи товаров в компактный вид для хранилища результатов.
+    Params:
+        records (List[tuple]): Записи товаров (значения полей Product.get_param_list()).
+    Returns:
+        bytes: Json без отступов, сжатый zlib, если включено Setting.get_cache_compress().
+    """
+    data: bytes = json.dumps(records, ensure_ascii=False, separators=(',', ':')).encode('UTF-8')
+    if Setting.get_cache_compress():
+        return _FORMAT_ZLIB + zlib.compress(data)
+    return _FORMAT_JSON + data
+
+
+def decode_records(payload: bytes) -> List[list]:
+    """
+    Функция восстанавливает записи товаров, сохраненные encode_records().
+    Params:
+        payload (bytes): Сохраненный результат.
+    Returns:
+        List[list]: Записи товаров.
+    Raises:
+        ValueError: Неизвестный формат результата.
+    """
+    marker, data = payload[:1], payload[1:]
+    if marker == _FORMAT_ZLIB:
+        data = zlib.decompress(data)
+    elif marker != _FORMAT_JSON:
+        raise ValueError(f'Неизвестный формат сохраненного результата: {marker!r}')
+    return json.loads(data)
@@ -1,41 +1,34 @@
 import json
-from typing import TypeVar
+from typing import TypeVar, Dict
 from api_site.config_get_requests.dict_methods import dict_methods
+from api_site.utils.request_key import RequestKey
 from common_utils.config_log import logger
-from common_utils.config import Setting
 
 
 T = TypeVar('T')
 
 
-def request_api(model_requests: T, method: str, *param, **params) -> None:
+def request_api(model_requests: T, key: RequestKey, query: str | None = None) -> Dict | None:
     """
-    Функция предназначения для преобразования результата запроса во временный системный файл (name.json).
+    Функция выполняет запрос к API и возвращает разобранный ответ для сохранения в хранилище результатов.
     Функция принимает параметры один из которых(model_requests) инициализирует запрос url.
     Args:
         model_requests (T) : Принимает модель запроса
-        method (str) : Параметр предназначен для передачи типа запроса.
-        *param : Параметр предназначен для передачи параметров запроса.
-        **params : Параметр предназначен для передачи параметров запроса по ключу.
-
+        key (RequestKey) : Канонический ключ запроса, содержит тип и все параметры запроса.
+        query (str | None) : Текст запроса пользователя, который передается API вместо канонического текста ключа.
+    Returns:
+        Dict | None: Ответ API, в случае неудачи None.
     """
-    config_request: T = dict_methods(method.lower())  # извлекаются модели доступных методов.
-    response = model_requests(config_request, *param, **params).get_requests()  # происходит запрос к API.
-    product_name: str = ''.join(i for i in param)  # обрабатывается имя запроса.
-    path = ''.join(f"{Setting.get_path_for_json_dir()}/{method.lower()}_{product_name.lower()}.json")
+    config_request: T = dict_methods(key.method)  # извлекаются модели доступных методов.
+    response = model_requests(config_request, query or key.product, **key.get_params()).get_requests()  # запрос к API.
     try:
         if response:
-            with open(path, 'w', encoding='UTF-8') as file:
-                response = json.loads(response.text)
-                json.dump(response, file, indent=4)
+            return json.loads(response.text)
         else:
             raise Exception('Результат не был получен.')
     except Exception as err:
         logger.error(f'api_site/ \n\t'
                      f'{config_request=}\n\t'
-                     f'{param=}{params}\t'
+                     f'{key=}\t'
                      f'{err=}\n')
 
-
-if __name__ == '__main__':
-    print(Setting.get_path_for_json_dir())
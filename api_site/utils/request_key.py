@@ -0,0 +1,57 @@
+from typing import NamedTuple, Dict
+from api_site.config_get_requests.dict_methods import dict_methods
+
+
+class RequestKey(NamedTuple):
+    """
+    Канонический ключ запроса к API. Используется всеми слоями кеша: ResultCache в памяти, ResultStore
+    (строковое представление to_str()) и объединение одновременных запросов (SingleFlight).
+
+    Attributes:
+        method (str): Тип запроса.
+        product (str): Название товара.
+        country (str): Страна.
+        language (str): Язык.
+        page (int): Номер страницы.
+
+    Methods:
+        get_params(): Возвращает параметры запроса по ключу (без товара).
+        to_str(): Возвращает строковое представление ключа.
+    """
+    method: str
+    product: str
+    country: str
+    language: str
+    page: int
+
+    def get_params(self) -> Dict:
+        """Метод возвращает параметры запроса по ключу, которые передаются в модель запроса."""
+        return {'country': self.country, 'language': self.language, 'page': self.page}
+
+    def to_str(self) -> str:
+        """Метод возвращает строковое представление ключа."""
+        return '|'.join(str(value) for value in self)
+
+
+def _normalize(text: str) -> str:
+    """Функция приводит строку к нижнему регистру и убирает лишние пробелы."""
+    return ' '.join(str(text).split()).lower()
+
+
+def build_request_key(method: str, product: str, **kwargs) -> RequestKey:
+    """
+    Функция возвращает канонический ключ запроса.
+    Params:
+        method (str): Тип запроса.
+        product (str): Название товара.
+        **kwargs: Остальные параметры запроса (country, language, page).
+    Returns:
+        RequestKey
+    Notes:
+        Параметры, которые не были переданы, берутся из значений по умолчанию модели запроса (ConfigSearch.param),
+        поэтому запросы с явными и неявными значениями по умолчанию получат один ключ.
+    """
+    method: str = _normalize(method)
+    params: Dict = dict_methods(method).param(_normalize(product), **kwargs)
+    return RequestKey(method=method, product=_normalize(params['q']), country=_normalize(params['country']),
+                      language=_normalize(params['language']), page=int(params['page']))
@@ -0,0 +1,159 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Entry:
+    """Класс хранит результат в памяти: значение, оценку размера, срок хранения и признак пустого результата."""
+    __slots__ = ('value', 'size', 'expires_at', 'negative')
+
+    def __init__(self, value: Any, size: int, expires_at: float, negative: bool) -> None:
+        self.value: Any = value
+        self.size: int = size
+        self.expires_at: float = expires_at
+        self.negative: bool = negative
+
+
+class ResultCache:
+    """
+    Класс кеширует результаты запросов в памяти с ограничением по объему.
+
+    Methods:
+        get(key): Возвращает (True, результат) или (False, None), если результата нет или он устарел.
+        put(key, value): Сохраняет результат, если он проходит допуск по частоте запросов.
+        invalidate(key): Удаляет результат по ключу.
+        invalidate_if(predicate): Удаляет результаты, ключи которых удовлетворяют условию.
+        clear(): Удаляет все результаты.
+        get_stats(): Возвращает счетчики.
+
+    Notes:
+        Пустые результаты (None, []) хранятся Setting.get_result_cache_negative_ttl() секунд,
+        остальные Setting.get_result_cache_ttl() секунд.
+        Объем оценивается функцией sizeof. Если для нового результата не хватает места, сначала
+        удаляются устаревшие, затем давно не используемые результаты, но только если новый ключ
+        запрашивался чаще вытесняемого. Поэтому разовые запросы не вытесняют популярные.
+        Частота запросов считается по всем обращениям get(), счетчики периодически делятся пополам,
+        что бы старая популярность не сохранялась бесконечно.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, negative_ttl: float,
+                 sizeof: Callable[[Any], int], frequency_sample: int = 10000) -> None:
+        self.__max_bytes: int = max_bytes
+        self.__ttl: float = ttl
+        self.__negative_ttl: float = negative_ttl
+        self.__sizeof: Callable[[Any], int] = sizeof
+        self.__frequency_sample: int = frequency_sample
+        self.__lock: threading.Lock = threading.Lock()
+        self.__entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self.__frequency: Dict[Hashable, int] = {}
+        self.__frequency_events: int = 0
+        self.__bytes: int = 0
+        self.__stats: Dict[str, int] = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'expired': 0,
+                                        'evictions': 0, 'rejected': 0, 'invalidations': 0}
+
+    def __touch_frequency(self, key: Hashable) -> None:
+        """Метод увеличивает счетчик частоты ключа и периодически уменьшает все счетчики вдвое."""
+        self.__frequency[key] = self.__frequency.get(key, 0) + 1
+        self.__frequency_events += 1
+        if self.__frequency_events >= self.__frequency_sample:
+            self.__frequency = {k: count // 2 for k, count in self.__frequency.items() if count > 1}
+            self.__frequency_events = 0
+
+    def __remove(self, key: Hashable) -> None:
+        """Метод удаляет результат и уменьшает занятый объем."""
+        self.__bytes -= self.__entries.pop(key).size
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Метод возвращает результат по ключу.
+        Returns:
+            Tuple[bool, Any]: (True, результат) если результат найден, иначе (False, None).
+        """
+        with self.__lock:
+            self.__touch_frequency(key)
+            entry: _Entry | None = self.__entries.get(key)
+            if entry is None:
+                self.__stats['misses'] += 1
+                return False, None
+            if entry.expires_at <= monotonic():
+                self.__remove(key)
+                self.__stats['expired'] += 1
+                self.__stats['misses'] += 1
+                return False, None
+            self.__entries.move_to_end(key)
+            self.__stats['negative_hits' if entry.negative else 'hits'] += 1
+            return True, entry.value
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """
+        Метод сохраняет результат.
+        Returns:
+            bool: True, если результат сохранен, False если не прошел допуск или больше всего кеша.
+        """
+        negative: bool = not value
+        size: int = self.__sizeof(value)
+        now: float = monotonic()
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            if size > self.__max_bytes:
+                self.__stats['rejected'] += 1
+                return False
+            if self.__bytes + size > self.__max_bytes:
+                for old_key in [k for k, e in self.__entries.items() if e.expires_at <= now]:
+                    self.__remove(old_key)
+                    self.__stats['expired'] += 1
+            frequency: int = self.__frequency.get(key, 0)
+            victims: list = []
+            free: int = self.__max_bytes - self.__bytes
+            for old_key in self.__entries:
+                if free >= size:
+                    break
+                if self.__frequency.get(old_key, 0) >= frequency:
+                    self.__stats['rejected'] += 1
+                    return False
+                victims.append(old_key)
+                free += self.__entries[old_key].size
+            for old_key in victims:
+                self.__remove(old_key)
+                self.__stats['evictions'] += 1
+            ttl: float = self.__negative_ttl if negative else self.__ttl
+            self.__entries[key] = _Entry(value, size, now + ttl, negative)
+            self.__bytes += size
+            return True
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Метод удаляет результат по ключу. Returns: bool: True, если результат был в кеше."""
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+                self.__stats['invalidations'] += 1
+                return True
+            return False
+
+    def invalidate_if(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Метод удаляет результаты, ключи которых удовлетворяют predicate. Returns: int: кол-во удаленных."""
+        with self.__lock:
+            keys: list = [key for key in self.__entries if predicate(key)]
+            for key in keys:
+                self.__remove(key)
+            self.__stats['invalidations'] += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Метод удаляет все результаты."""
+        with self.__lock:
+            self.__stats['invalidations'] += len(self.__entries)
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Метод возвращает счетчики.
+        Returns:
+            Dict: hits, negative_hits - попадания по пустым результатам, misses, expired, evictions,
+                rejected - результаты не прошедшие допуск, invalidations, entries, bytes.
+        """
+        with self.__lock:
+            return dict(self.__stats, entries=len(self.__entries), bytes=self.__bytes)
@@ -0,0 +1,211 @@
+import heapq
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from api_site.utils.product_obj import Product
+
+try:  # NumPy необязателен: без него используются array и встроенные функции сортировки.
+    import numpy as np
+except ImportError:
+    np = None
+
+PRICE: str = 'price'
+RATING: str = 'rating'
+
+
+class PriceBand(NamedTuple):
+    """
+    Ценовой диапазон результата.
+
+    Attributes:
+        low (float): Нижняя граница, входит в диапазон.
+        high (float): Верхняя граница, входит в диапазон только у последнего диапазона.
+        include_high (bool): Входит ли верхняя граница в диапазон.
+    """
+    low: float
+    high: float
+    include_high: bool
+
+
+class _Columns:
+    """Класс хранит свойства товаров результата в виде типизированных массивов."""
+    __slots__ = ('price', 'rating', 'store', 'store_names')
+
+    def __init__(self, products: Sequence[Product]) -> None:
+        prices: List[float] = [any_product.get_price() for any_product in products]
+        ratings: List[float] = [any_product.get_product_rating() for any_product in products]
+        ratings = [float(rating) if isinstance(rating, (int, float)) else 0.0 for rating in ratings]
+        codes: Dict[str, int] = {}
+        stores: List[int] = [codes.setdefault(any_product.get_store_name(), len(codes)) for any_product in products]
+        self.store_names: List[str] = list(codes)
+        if np is not None:
+            self.price = np.array(prices, dtype=np.float64)
+            self.rating = np.array(ratings, dtype=np.float64)
+            self.store = np.array(stores, dtype=np.int32)
+        else:
+            self.price = array('d', prices)
+            self.rating = array('d', ratings)
+            self.store = array('i', stores)
+
+
+class ResultSet(list):
+    """
+    Список товаров результата запроса, рядом с которым хранятся цены, рейтинги и магазины
+    в виде типизированных массивов (NumPy, если установлен, иначе array).
+
+    Methods:
+        argsort(by, reverse, indices): Возвращает индексы товаров, упорядоченные по цене или рейтингу.
+        filter_range(by, low, high, indices, include_high): Возвращает индексы товаров, у которых значение в диапазоне.
+        filter_store(name, indices): Возвращает индексы товаров магазина.
+        top_k(by, k, reverse, indices): Возвращает индексы k первых товаров по цене или рейтингу.
+        price_bands(count): Возвращает границы ценовых диапазонов с равным кол-вом товаров.
+        take(indices): Возвращает товары по индексам.
+        query(sort_by, reverse, price_range, min_rating, limit): Сортировка, фильтры и ограничение кол-ва.
+
+    Notes:
+        Массивы создаются при первой сортировке или фильтрации и запоминаются, поэтому результат,
+        сохраненный в кеше, повторно сортируется и фильтруется без нового запроса к API.
+        Результат не предназначен для изменения: после изменения списка массивы не обновляются.
+        Товары без рейтинга имеют рейтинг 0.
+    """
+    __slots__ = ('__columns',)
+
+    def __init__(self, products: Iterable[Product] = ()) -> None:
+        super().__init__(products)
+        self.__columns: Optional[_Columns] = None
+
+    def __get_column(self, by: str):
+        """Метод возвращает массив свойства by (PRICE | RATING)."""
+        if self.__columns is None:
+            self.__columns = _Columns(self)
+        if by == PRICE:
+            return self.__columns.price
+        if by == RATING:
+            return self.__columns.rating
+        raise ValueError(f'Неизвестное свойство для сортировки: {by}')
+
+    def __all(self, indices: Optional[Sequence[int]]) -> Sequence[int]:
+        """Метод возвращает индексы всех товаров, если индексы не переданы."""
+        if indices is not None:
+            return indices
+        return np.arange(len(self)) if np is not None else range(len(self))
+
+    def argsort(self, by: str = PRICE, reverse: bool = False,
+                indices: Optional[Sequence[int]] = None) -> Sequence[int]:
+        """
+        Метод возвращает индексы товаров, упорядоченные по свойству by.
+        Params:
+            by (str): PRICE | RATING.
+            reverse (bool): По убыванию.
+            indices (Sequence[int] | None): Индексы, среди которых выполняется сортировка, по умолчанию все товары.
+        """
+        column = self.__get_column(by)
+        indices = self.__all(indices)
+        if np is not None:
+            indices = np.asarray(indices, dtype=np.intp)
+            values = column[indices]
+            return indices[np.argsort(-values if reverse else values, kind='stable')]
+        return sorted(indices, key=column.__getitem__, reverse=reverse)
+
+    def filter_range(self, by: str = PRICE, low: Optional[float] = None, high: Optional[float] = None,
+                     indices: Optional[Sequence[int]] = None, include_high: bool = True) -> Sequence[int]:
+        """
+        Метод возвращает индексы товаров, у которых значение свойства by в диапазоне [low, high]
+        или [low, high), если include_high=False. Граница None не ограничивает диапазон.
+        """
+        column = self.__get_column(by)
+        indices = self.__all(indices)
+        if np is not None:
+            indices = np.asarray(indices, dtype=np.intp)
+            values = column[indices]
+            mask = np.ones(len(indices), dtype=bool)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= (values <= high) if include_high else (values < high)
+            return indices[mask]
+        return [i for i in indices if (low is None or column[i] >= low)
+                and (high is None or (column[i] <= high if include_high else column[i] < high))]
+
+    def filter_store(self, name: str, indices: Optional[Sequence[int]] = None) -> Sequence[int]:
+        """Метод возвращает индексы товаров магазина name."""
+        self.__get_column(PRICE)
+        indices = self.__all(indices)
+        if name not in self.__columns.store_names:
+            return indices[:0]
+        code: int = self.__columns.store_names.index(name)
+        if np is not None:
+            indices = np.asarray(indices, dtype=np.intp)
+            return indices[self.__columns.store[indices] == code]
+        return [i for i in indices if self.__columns.store[i] == code]
+
+    def top_k(self, by: str = PRICE, k: int = 10, reverse: bool = False,
+              indices: Optional[Sequence[int]] = None) -> Sequence[int]:
+        """
+        Метод возвращает индексы k первых товаров, упорядоченных по свойству by,
+        без сортировки всего результата.
+        """
+        column = self.__get_column(by)
+        indices = self.__all(indices)
+        if len(indices) <= k:
+            return self.argsort(by, reverse, indices)
+        if np is not None:
+            indices = np.asarray(indices, dtype=np.intp)
+            values = -column[indices] if reverse else column[indices]
+            part = np.argpartition(values, k - 1)[:k]
+            return indices[part[np.argsort(values[part], kind='stable')]]
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(k, indices, key=column.__getitem__)
+
+    def price_bands(self, count: int = 3) -> List[PriceBand]:
+        """
+        Метод возвращает не более count ценовых диапазонов, в каждый из которых входит примерно равное кол-во товаров.
+        Notes:
+            Границы выбираются из цен товаров, поэтому пустых диапазонов нет, одинаковые границы объединяются.
+            Верхняя граница входит только в последний диапазон, поэтому товар не попадает в два диапазона.
+        """
+        if not self:
+            return []
+        column = self.__get_column(PRICE)
+        ordered: List[float] = np.sort(column).tolist() if np is not None else sorted(column)
+        edges: List[float] = []
+        for i in range(count + 1):
+            edge: float = ordered[round(i * (len(ordered) - 1) / count)]
+            if not edges or edge > edges[-1]:
+                edges.append(edge)
+        if len(edges) == 1:  # у всех товаров одна цена.
+            return [PriceBand(edges[0], edges[0], True)]
+        return [PriceBand(low, high, i == len(edges) - 2) for i, (low, high) in enumerate(zip(edges[:-1], edges[1:]))]
+
+    def take(self, indices: Sequence[int]) -> List[Product]:
+        """Метод возвращает товары по индексам."""
+        return [self[i] for i in indices]
+
+    def query(self, sort_by: Optional[str] = None, reverse: bool = False,
+              price_range: Optional[Tuple[Optional[float], Optional[float]] | PriceBand] = None,
+              min_rating: Optional[float] = None, limit: Optional[int] = None) -> List[Product]:
+        """
+        Метод возвращает товары после фильтров и сортировки.
+        Params:
+            sort_by (str | None): PRICE | RATING, None - исходный порядок.
+            reverse (bool): По убыванию.
+            price_range (Tuple | PriceBand | None): Ценовой диапазон (low, high) с обеими границами
+                или диапазон price_bands().
+            min_rating (float | None): Минимальный рейтинг.
+            limit (int | None): Максимальное кол-во товаров.
+        """
+        indices: Sequence[int] = self.__all(None)
+        if price_range is not None:
+            low, high = price_range[0], price_range[1]
+            include_high: bool = price_range.include_high if isinstance(price_range, PriceBand) else True
+            indices = self.filter_range(PRICE, low, high, indices=indices, include_high=include_high)
+        if min_rating is not None:
+            indices = self.filter_range(RATING, low=min_rating, indices=indices)
+        if sort_by is not None:
+            if limit is not None:
+                indices = self.top_k(sort_by, limit, reverse, indices)
+            else:
+                indices = self.argsort(sort_by, reverse, indices)
+        if limit is not None:
+            indices = indices[:limit]
+        return self.take(indices)
@@ -0,0 +1,203 @@
+import os
+import sqlite3
+import threading
+from time import time
+from typing import Optional, NamedTuple, Dict
+
+from common_utils.config_log import logger
+
+
+class StoreEntry(NamedTuple):
+    """
+    Класс описывает сохраненный результат.
+
+    Attributes:
+        payload (bytes): Результат запроса.
+        created_at (float): Время сохранения результата (timestamp).
+    """
+    payload: bytes
+    created_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Метод возвращает True, если с момента сохранения результата прошло меньше ttl секунд."""
+        return time() - self.created_at < ttl
+
+
+# Точность времени последнего обращения (секунды): чтение результата не выполняет запись при каждом попадании.
+_ACCESS_GRANULARITY: float = 60.0
+_COMPACT_STEP_PAGES: int = 256  # кол-во свободных страниц, освобождаемых за один шаг compact().
+
+
+class ResultStore:
+    """
+    Класс хранит результаты запросов к API в одном файле SQLite (ключ - значение).
+
+    Methods:
+        get(key): Возвращает сохраненный результат и время его сохранения по ключу.
+        get_created_at(key): Возвращает время сохранения результата по ключу.
+        put(key, payload): Сохраняет результат по ключу.
+        evict(max_count, max_bytes, batch): Удаляет давно не используемые результаты сверх лимитов.
+        get_stats(): Возвращает метрики хранилища.
+        compact(min_free_bytes): Сжимает файл хранилища частями, если в нем достаточно свободного места.
+
+    Notes:
+        Таблица results использует ключ запроса в качестве первичного ключа, поэтому поиск выполняется по индексу,
+        без обхода директории и открытия отдельных файлов. Журнал WAL позволяет читать данные во время записи,
+        а каждая запись выполняется одной транзакцией, поэтому в хранилище не может оказаться частично записанный
+        результат. Соединение одно на процесс, обращения к нему из разных потоков последовательны.
+        Для каждого результата хранится время последнего обращения и размер в байтах,
+        по ним evict() удаляет записи в порядке LRU. Время обращения обновляется не чаще раза
+        в _ACCESS_GRANULARITY секунд, поэтому повторные попадания в кеш выполняются без записи в файл.
+    """
+    __columns: Dict[str, str] = {'created_at': 'REAL NOT NULL DEFAULT 0',
+                                 'accessed_at': 'REAL NOT NULL DEFAULT 0',
+                                 'size': 'INTEGER NOT NULL DEFAULT 0'}
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.__path: str = path
+        self.__lock: threading.Lock = threading.Lock()
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+        self.__evicted_bytes: int = 0
+        self.__connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False,
+                                                                isolation_level=None)
+        with self.__lock:
+            if self.__connection.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                # INCREMENTAL позволяет compact() освобождать место частями, для существующего файла
+                # режим применяется после однократного VACUUM.
+                self.__connection.execute('PRAGMA auto_vacuum=INCREMENTAL')
+                self.__connection.execute('VACUUM')
+            self.__connection.execute('PRAGMA journal_mode=WAL')
+            self.__connection.execute('PRAGMA synchronous=NORMAL')
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS results ('
+                                      'key TEXT PRIMARY KEY, '
+                                      'payload BLOB NOT NULL)')
+            columns = {row[1] for row in self.__connection.execute('PRAGMA table_info(results)')}
+            for column, definition in self.__columns.items():
+                if column not in columns:  # хранилище создано предыдущей версией.
+                    self.__connection.execute(f'ALTER TABLE results ADD COLUMN {column} {definition}')
+            if 'size' not in columns:
+                self.__connection.execute('UPDATE results SET size = length(CAST(payload AS BLOB))')
+            self.__connection.execute('CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)')
+
+    def get(self, key: str) -> Optional[StoreEntry]:
+        """
+        Метод возвращает результат по ключу и обновляет время последнего обращения к нему,
+        если оно было обновлено раньше, чем _ACCESS_GRANULARITY секунд назад.
+        Returns:
+            StoreEntry | None: Сохраненный результат и время его сохранения, в случае отсутствия None.
+        """
+        with self.__lock:
+            row = self.__connection.execute('SELECT payload, created_at, accessed_at FROM results WHERE key = ?',
+                                            (key,)).fetchone()
+            if row is None:
+                self.__misses += 1
+                return None
+            self.__hits += 1
+            now: float = time()
+            if now - row[2] >= _ACCESS_GRANULARITY:  # запись выполняется не чаще раза в _ACCESS_GRANULARITY.
+                self.__connection.execute('UPDATE results SET accessed_at = ? WHERE key = ?', (now, key))
+        return StoreEntry(row[0], row[1])
+
+    def get_created_at(self, key: str) -> Optional[float]:
+        """
+        Метод возвращает время сохранения результата, не считая обращение попаданием в кеш.
+        Returns:
+            float | None: Время сохранения (timestamp), в случае отсутствия None.
+        """
+        with self.__lock:
+            row = self.__connection.execute('SELECT created_at FROM results WHERE key = ?', (key,)).fetchone()
+        if row:
+            return row[0]
+
+    def put(self, key: str, payload: bytes) -> None:
+        """Метод сохраняет результат по ключу, если результат уже был сохранен, он будет заменен."""
+        now: float = time()
+        with self.__lock:
+            self.__connection.execute('INSERT OR REPLACE INTO results (key, payload, created_at, accessed_at, size) '
+                                      'VALUES (?, ?, ?, ?, ?)', (key, payload, now, now, len(payload)))
+
+    def evict(self, max_count: int, max_bytes: int, batch: int) -> int:
+        """
+        Метод удаляет результаты, к которым дольше всего не обращались, пока хранилище превышает лимиты.
+        За один вызов удаляется не более batch записей, что бы не блокировать хранилище надолго.
+        Params:
+            max_count (int): Максимальное кол-во результатов.
+            max_bytes (int): Максимальный суммарный размер результатов в байтах.
+            batch (int): Максимальное кол-во удаляемых за вызов записей.
+        Returns:
+            int: Кол-во удаленных результатов.
+        """
+        with self.__lock:
+            count, total_bytes = self.__connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) '
+                                                           'FROM results').fetchone()
+            removed: int = 0
+            if count <= max_count and total_bytes <= max_bytes:
+                return removed
+            rows = self.__connection.execute('SELECT key, size FROM results ORDER BY accessed_at LIMIT ?',
+                                             (batch,)).fetchall()
+            keys: list = []
+            removed_bytes: int = 0
+            for key, size in rows:
+                if count <= max_count and total_bytes <= max_bytes:
+                    break
+                keys.append((key,))
+                count -= 1
+                total_bytes -= size
+                removed_bytes += size
+            self.__connection.execute('BEGIN')
+            try:
+                self.__connection.executemany('DELETE FROM results WHERE key = ?', keys)
+                self.__connection.execute('COMMIT')
+            except BaseException:  # соединение общее, оно не должно остаться в открытой транзакции.
+                self.__connection.execute('ROLLBACK')
+                raise
+            removed = len(keys)
+            self.__evictions += removed
+            self.__evicted_bytes += removed_bytes
+            return removed
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Метод возвращает метрики хранилища.
+        Returns:
+            Dict: hits, misses - попадания и промахи get(), evictions - удаленные evict() результаты,
+                evicted_bytes - их суммарный размер, entries - кол-во результатов, bytes - суммарный размер результатов.
+        """
+        with self.__lock:
+            entries, total_bytes = self.__connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) '
+                                                             'FROM results').fetchone()
+            return {'hits': self.__hits, 'misses': self.__misses, 'evictions': self.__evictions,
+                    'evicted_bytes': self.__evicted_bytes, 'entries': entries, 'bytes': total_bytes}
+
+    def compact(self, min_free_bytes: int = 0) -> bool:
+        """
+        Метод возвращает файлу место, которое осталось после удаленных записей, и переносит журнал WAL
+        в основной файл, уменьшая его.
+        Params:
+            min_free_bytes (int): Сжатие не выполняется, если свободного места в файле меньше.
+        Returns:
+            bool: True, если файл был сжат.
+        Notes:
+            Хранилище использует auto_vacuum=INCREMENTAL: свободные страницы освобождаются частями
+            по _COMPACT_STEP_PAGES (PRAGMA incremental_vacuum), блокировка освобождается между частями,
+            поэтому сжатие не задерживает чтение результатов надолго.
+        """
+        with self.__lock:
+            page_size: int = self.__connection.execute('PRAGMA page_size').fetchone()[0]
+            free_pages: int = self.__connection.execute('PRAGMA freelist_count').fetchone()[0]
+        if not free_pages or free_pages * page_size < min_free_bytes:
+            return False
+        try:
+            while free_pages > 0:
+                with self.__lock:
+                    self.__connection.execute(f'PRAGMA incremental_vacuum({_COMPACT_STEP_PAGES})').fetchall()
+                    free_pages = self.__connection.execute('PRAGMA freelist_count').fetchone()[0]
+            with self.__lock:
+                self.__connection.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+        except sqlite3.Error as err:
+            logger.error(f'api_site/utils/result_store.py Не удалось сжать хранилище {self.__path}: {err=}')
+            return False
+        return True
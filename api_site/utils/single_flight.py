@@ -0,0 +1,85 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """Класс хранит состояние одного выполняемого запроса: событие завершения, результат и ошибку."""
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.event: threading.Event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Класс объединяет одновременные одинаковые запросы в один вызов.
+
+    Methods:
+        do(key, func, *args, **kwargs): Выполняет func, если по данному ключу нет выполняемого запроса,
+            иначе ожидает завершения уже выполняемого запроса и возвращает его результат.
+        get_stats(): Возвращает счетчики вызовов.
+
+    Notes:
+        Первый поток (ведущий) выполняет функцию, остальные потоки с тем же ключом ожидают его
+        и получают тот же результат (или ту же ошибку). После завершения ключ удаляется,
+        поэтому следующий запрос выполнится заново.
+    """
+
+    def __init__(self) -> None:
+        self.__lock: threading.Lock = threading.Lock()
+        self.__calls: Dict[Hashable, _Call] = {}
+        self.__executed: int = 0
+        self.__coalesced: int = 0
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Метод выполняет запрос или присоединяется к уже выполняемому запросу с тем же ключом.
+        Params:
+            key (Hashable): Нормализованный ключ запроса.
+            func (Callable): Функция запроса.
+        Returns:
+            Any: Результат func.
+        Raises:
+            Ошибка, возникшая в func, передается всем ожидающим потокам.
+        """
+        with self.__lock:
+            call: _Call | None = self.__calls.get(key)
+            leader: bool = call is None
+            if leader:
+                call = _Call()
+                self.__calls[key] = call
+                self.__executed += 1
+            else:
+                self.__coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.event.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Метод возвращает счетчики.
+        Returns:
+            Dict: executed - выполненные запросы, coalesced - объединенные с ними запросы,
+                in_flight - запросы выполняемые в данный момент.
+        """
+        with self.__lock:
+            return {'executed': self.__executed, 'coalesced': self.__coalesced, 'in_flight': len(self.__calls)}
+
+
+single_flight: SingleFlight = SingleFlight()
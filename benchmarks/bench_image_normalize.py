@@ -0,0 +1,75 @@
+"""
+Уменьшение фото товаров: image_normalizer.normalize_image на синтетических изображениях, похожих на фото
+из магазинов (крупные JPEG и PNG с прозрачным фоном). Выводит исходный объем, объем после уменьшения,
+сэкономленные байты и время обработки одного изображения.
+Требуется Pillow.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_image_normalize
+"""
+import importlib.util
+import io
+import os
+import timeit
+from types import ModuleType
+from typing import List, Tuple
+
+
+def _load_image_normalizer() -> ModuleType:
+    """
+    Функция загружает модуль по пути к файлу: импорт пакета tg_bot создает бота и подключается к БД,
+    а модулю image_normalizer они не нужны.
+    """
+    path: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'tg_bot', 'bot_utils', 'image_normalizer.py')
+    spec = importlib.util.spec_from_file_location('image_normalizer', path)
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+image_normalizer: ModuleType = _load_image_normalizer()
+
+REPEAT: int = 3
+
+
+def make_image(width: int, height: int, image_format: str) -> bytes:
+    """Функция создает изображение: градиент с шумом, похожий на фото товара на фоне."""
+    Image = image_normalizer.Image
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 24)
+    image = Image.merge('RGB', (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    buffer = io.BytesIO()
+    if image_format == 'PNG':
+        image.putalpha(gradient)
+        image.save(buffer, format='PNG')
+    else:
+        image.save(buffer, format='JPEG', quality=95)
+    return buffer.getvalue()
+
+
+CORPUS: Tuple[Tuple[int, int, str], ...] = (
+    (4000, 3000, 'JPEG'), (3000, 3000, 'JPEG'), (2000, 2000, 'PNG'), (1200, 900, 'JPEG'), (1600, 1600, 'PNG'),
+)
+
+
+def main() -> None:
+    if not image_normalizer.is_available():
+        print('Pillow не установлен или PHOTO_MAX_SIDE = 0: изображения отправляются без изменений.')
+        return
+    total_before: int = 0
+    total_after: int = 0
+    images: List[Tuple[str, bytes]] = [(f'{w}x{h} {fmt}', make_image(w, h, fmt)) for w, h, fmt in CORPUS]
+    for name, pict in images:
+        result: bytes = image_normalizer.normalize_image(pict)
+        seconds: float = min(timeit.repeat(lambda: image_normalizer.normalize_image(pict), number=1, repeat=REPEAT))
+        total_before += len(pict)
+        total_after += len(result)
+        print(f'{name:<16} {len(pict):>10d} -> {len(result):>9d} байт  '
+              f'сэкономлено: {1 - len(result) / len(pict):7.2%}  {seconds * 1e3:8.1f} мс')
+    print(f'{"итого":<16} {total_before:>10d} -> {total_after:>9d} байт  '
+          f'сэкономлено: {total_before - total_after} байт ({1 - total_after / total_before:.2%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Сравнение разбора цен: price_parser.parse_price и прежний Product._price_edit (посимвольная сборка строки и float()).
+Точность проверяется на корпусе строк цен, составленном по форматам из ответов API маркетплейсов. Время разбора
+измеряется и на реальных строках цен из хранилища результатов (ответы API, сохраненные ботом), если оно есть.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_price_parser
+"""
+import os
+import random
+import sqlite3
+import timeit
+from typing import Callable, List, Tuple
+
+from api_site.utils.price_parser import parse_price
+from api_site.utils.product_obj import Product
+from api_site.utils.record_codec import decode_records
+from common_utils.config import Setting
+
+COUNT: int = 100000
+
+
+def legacy_price_edit(price: str) -> float:
+    """Прежняя реализация Product._price_edit, оставлена только для сравнения."""
+    return float(((''.join(dig for dig in price if dig.isdigit() or dig == ',' or dig == '.')).replace(",", '.')))
+
+
+def _group(integer: int, separator: str) -> str:
+    """Функция разделяет разряды числа separator."""
+    return f'{integer:,}'.replace(',', separator)
+
+
+FORMATS: Tuple[Callable[[int, int], str], ...] = (
+    lambda i, c: f'{_group(i, " ")},{c:02d} ₽',
+    lambda i, c: f'{_group(i, " ")} ₽',
+    lambda i, c: f'{_group(i, " ")} руб.',
+    lambda i, c: f'{i},{c:02d}',
+    lambda i, c: f'${_group(i, ",")}.{c:02d}',
+    lambda i, c: f'{_group(i, ".")},{c:02d} €',
+    lambda i, c: f'от {_group(i, " ")} р.',
+    lambda i, c: f'{i}.{c:02d}',
+    lambda i, c: f'{_group(i, " ")} ₸',
+    lambda i, c: f'{_group(i, chr(160))},{c:02d} ₽',
+)
+
+
+def make_corpus(count: int, seed: int = 1) -> List[Tuple[str, float]]:
+    """Функция возвращает строки цен и ожидаемые значения."""
+    rnd: random.Random = random.Random(seed)
+    corpus: List[Tuple[str, float]] = []
+    for _ in range(count):
+        integer: int = rnd.choice((rnd.randint(1, 999), rnd.randint(1000, 99999), rnd.randint(100000, 2500000)))
+        cents: int = rnd.choice((0, 0, 50, 99, rnd.randint(1, 99)))
+        number: int = rnd.randrange(len(FORMATS))
+        expected: float = integer if number in (1, 2, 6, 8) else integer + cents / 100
+        corpus.append((FORMATS[number](integer, cents), expected))
+    return corpus
+
+
+def load_store_prices(path: str, count: int) -> List[str]:
+    """
+    Функция возвращает строки цен из хранилища результатов.
+    Хранилище открывается только для чтения, поэтому время обращения к результатам не меняется.
+    """
+    if not os.path.isfile(path):
+        return []
+    index: int = Product.get_param_list().index('price')
+    prices: List[str] = []
+    connection: sqlite3.Connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        for (payload,) in connection.execute('SELECT payload FROM results'):
+            prices.extend(record[index] for record in decode_records(payload) if isinstance(record[index], str))
+            if len(prices) >= count:
+                break
+    finally:
+        connection.close()
+    return prices[:count]
+
+
+def accuracy(func: Callable[[str], float], corpus: List[Tuple[str, float]]) -> Tuple[float, int]:
+    """Функция возвращает долю верно разобранных цен и кол-во ошибок разбора."""
+    correct: int = 0
+    errors: int = 0
+    for text, expected in corpus:
+        try:
+            correct += abs(func(text) - expected) < 1e-6
+        except ValueError:
+            errors += 1
+    return correct / len(corpus), errors
+
+
+def safe(func: Callable[[str], float]) -> Callable[[str], float | None]:
+    """Функция возвращает func, которая вместо исключения возвращает None (для замера времени)."""
+    def wrapper(text: str) -> float | None:
+        try:
+            return func(text)
+        except ValueError:
+            return None
+    return wrapper
+
+
+def measure(func: Callable[[str], object], texts: List[str]) -> float:
+    """Функция возвращает время разбора одной цены (мкс)."""
+    timed: Callable = safe(func)
+    return min(timeit.repeat(lambda: [timed(text) for text in texts], number=1, repeat=5)) / len(texts) * 1e6
+
+
+def main() -> None:
+    corpus: List[Tuple[str, float]] = make_corpus(COUNT)
+    texts: List[str] = [text for text, _ in corpus]
+    store_texts: List[str] = load_store_prices(Setting.get_path_result_store(), COUNT)
+    print(f'цен из хранилища результатов: {len(store_texts)}')
+
+    for name, func, amount in (('legacy _price_edit', legacy_price_edit, legacy_price_edit),
+                               ('parse_price', parse_price, lambda text: parse_price(text).amount)):
+        share, errors = accuracy(amount, corpus)
+        timing: str = f'{measure(func, texts):6.2f} мкс/цена'
+        if store_texts:
+            timing += f', хранилище: {measure(func, store_texts):6.2f} мкс/цена'
+        print(f'{name:<22} верно: {share:7.2%}  исключений: {errors:6d}  {timing}')
+
+
+if __name__ == '__main__':
+    main()
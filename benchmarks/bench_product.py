@@ -0,0 +1,90 @@
+"""
+Сравнение расхода памяти и времени создания объектов товара: Product (__slots__, ленивые цена и характеристики)
+и прежняя реализация LegacyProduct (__dict__, цена и характеристики вычисляются при создании).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_product
+"""
+import timeit
+import tracemalloc
+from typing import Callable, List
+
+from api_site.utils.product_obj import Product
+
+COUNT: int = 10000
+
+
+class LegacyProduct:
+    """Прежняя реализация Product, оставлена только для сравнения."""
+
+    def __init__(self, product_id, product_rating, product_title, store_name, product_photos, product_description,
+                 product_attributes, price, shipping, offer_page_url) -> None:
+        self._product_id = product_id
+        self._store_name = store_name
+        self._product_title = product_title
+        self._product_photos = product_photos
+        self._product_description = product_description
+        self._price = self._price_edit(price)
+        self._product_rating = product_rating
+        self._shipping = shipping
+        self._offer_page_url = offer_page_url
+        self._product_attributes = self._product_att(product_attributes)
+
+    @staticmethod
+    def _price_edit(price: str) -> float:
+        return float(((''.join(dig for dig in price if dig.isdigit() or dig == ',' or dig == '.')).replace(",", '.')))
+
+    @staticmethod
+    def _product_att(attributes: dict) -> str:
+        if attributes:
+            str_: str = ''
+            for params, text in attributes.items():
+                str_ += ''.join(params + ':' + text + '\n')
+            return str_
+        return 'Информация не доступна.'
+
+    @classmethod
+    def from_record(cls, record: tuple | list) -> 'LegacyProduct':
+        return cls(**dict(zip(Product.get_param_list(), record)))
+
+
+def make_records(count: int) -> List[tuple]:
+    """Функция возвращает записи товаров в формате хранилища результатов."""
+    return [(f'id-{i}', 4.5, f'Смартфон Apple iPhone 15 128 ГБ, вариант {i}', [f'https://example.com/{i}.webp'],
+             'Описание товара ' * 5, f'{1000 + i},99 ₽', 'Бесплатная доставка', f'https://shop.example.com/{i}',
+             'Магазин', {'Цвет': 'черный', 'Память': '128 ГБ', 'Экран': '6.1"', 'Гарантия': '1 год'})
+            for i in range(count)]
+
+
+def measure_memory(factory: Callable, records: List[tuple]) -> float:
+    """Функция возвращает расход памяти на один объект (байты), записи создаются заранее и не учитываются."""
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    objects: list = [factory(record) for record in records]
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / len(records)
+
+
+def measure_time(factory: Callable, records: List[tuple], number: int = 5) -> float:
+    """Функция возвращает среднее время создания одного объекта (микросекунды)."""
+    seconds: float = min(timeit.repeat(lambda: [factory(record) for record in records], number=1, repeat=number))
+    return seconds / len(records) * 1e6
+
+
+def main() -> None:
+    records: List[tuple] = make_records(COUNT)
+    for name, factory in (('LegacyProduct', LegacyProduct.from_record), ('Product', Product.from_record)):
+        print(f'{name:<14} память: {measure_memory(factory, records):8.1f} байт/объект  '
+              f'создание: {measure_time(factory, records):6.2f} мкс/объект')
+
+    def first_page() -> None:  # пользователь просматривает только первые 5 товаров из списка.
+        for any_product in [Product.from_record(record) for record in records[:100]][:5]:
+            any_product.get_price(), any_product.get_product_attributes()
+
+    print(f'Product: создание 100 объектов и просмотр 5: {min(timeit.repeat(first_page, number=100)) * 10:.3f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -9,23 +9,21 @@ def check_status_cache_of_files() -> None:
     Функция предназначена для работы с временными файлами.
 
     Notes:
-        Функция проверяет кол-во временных файлов.
-        В случае, если их кол-во превышает установленных лимитов в Setting.get_limit_folders(),
-        будет вызван метод Setting.sorted_list_dir(list_dir).
+        Результаты запросов хранятся в одном файле хранилища Setting.get_path_result_store().
+        Функция удаляет из папки кеша .json файлы, которые остались от прежнего формата кеша
+        (один файл на запрос) и больше не используются.
         После чего в журнал логирования будет внесена запись об совершенной оперции.
     Returns:
         None
     """
-    list_dir: List[str] = Setting.get_files_requests()
-    max_count: int = Setting.get_limit_folders()
-    if len(list_dir) < max_count:
+    list_dir: List[str] = [file for file in Setting.get_files_requests() if file.endswith('.json')]
+    if not list_dir:
         return
+    result = Setting.remove_files_requests(list_dir)
+    if isinstance(result, int):
+        logger.info(f"Из папки api_site/utils/requests_files были удалены временные файлы в кол-ве: {result}")
     else:
-        result = Setting.sorted_list_dir(list_dir)
-        if result is int:
-            logger.info(f"Из папки api_site/utils/requests были удалены временные файлы в кол-ве: {result}")
-        else:
-            logger.error(f'Возникла непредвиденная ошибка при удалении файлов. \n\t{result}')
+        logger.error(f'Возникла непредвиденная ошибка при удалении файлов. \n\t{result}')
 
 
 if __name__ == '__main__':
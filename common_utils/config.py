@@ -1,6 +1,6 @@
 import os
 import abc
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 import dotenv
 from datetime import datetime
@@ -16,8 +16,10 @@ class Setting(abc.ABC):
     """
     __current_dir = os.getcwd()
     __path_of_requests_dir = os.path.abspath(os.path.join(__current_dir + '/api_site/utils/requests_files/'))
+    __path_of_result_store = os.path.join(__path_of_requests_dir, 'results.sqlite3')
+    __path_of_photo_dir = os.path.abspath(os.path.join(__current_dir + '/tg_bot/photo_files/'))
     __path_log_file = os.path.abspath(os.path.join(__current_dir + '/log/log.log'))
-    __max_count_files = 1000
+    __max_count_results = 1000
 
     @staticmethod
     def get_token_tg() -> str:
@@ -60,21 +62,202 @@ class Setting(abc.ABC):
         """Передает X-RapidAPI-Host"""
         return os.getenv("X-RapidAPI-Host")
 
+    @staticmethod
+    def get_http_timeout() -> Tuple[float, float]:
+        """Метод возвращает таймауты (connect, read) исходящих HTTP запросов в секундах."""
+        return float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05)), float(os.getenv('HTTP_READ_TIMEOUT', 15))
+
+    @staticmethod
+    def get_http_pool_size() -> int:
+        """Метод возвращает кол-во соединений, которые хранятся в пуле для одного хоста."""
+        return int(os.getenv('HTTP_POOL_SIZE', 10))
+
+    @staticmethod
+    def get_http_max_retries() -> int:
+        """Метод возвращает кол-во попыток запроса к API."""
+        return int(os.getenv('HTTP_MAX_RETRIES', 3))
+
+    @staticmethod
+    def get_http_backoff() -> Tuple[float, float]:
+        """Метод возвращает базовую и максимальную паузу (в секундах) между повторными попытками запроса."""
+        return float(os.getenv('HTTP_BACKOFF_BASE', 0.5)), float(os.getenv('HTTP_BACKOFF_CAP', 4))
+
+    @staticmethod
+    def get_rate_limit_rps() -> float:
+        """Метод возвращает допустимое кол-во запросов к API в секунду."""
+        return float(os.getenv('RATE_LIMIT_RPS', 5))
+
+    @staticmethod
+    def get_rate_limit_burst() -> int:
+        """Метод возвращает кол-во запросов к API, которые можно выполнить подряд без ожидания."""
+        return int(os.getenv('RATE_LIMIT_BURST', 5))
+
+    @staticmethod
+    def get_rate_limit_wait() -> float:
+        """Метод возвращает максимальное время (в секундах) ожидания очереди запросов к API."""
+        return float(os.getenv('RATE_LIMIT_WAIT', 10))
+
+    @staticmethod
+    def get_rate_limit_reserve() -> int:
+        """Метод возвращает остаток квоты API, который не расходуется фоновыми запросами."""
+        return int(os.getenv('RATE_LIMIT_RESERVE', 50))
+
+    @staticmethod
+    def get_circuit_failure_threshold() -> int:
+        """Метод возвращает кол-во ошибок запросов подряд, после которых API считается недоступным."""
+        return int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+
+    @staticmethod
+    def get_circuit_reset_timeout() -> float:
+        """Метод возвращает время (в секундах), через которое к недоступному API будет отправлен пробный запрос."""
+        return float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))
+
+    @staticmethod
+    def get_search_pages() -> Tuple[int, ...]:
+        """Метод возвращает номера страниц, которые одновременно запрашиваются для /custom."""
+        return tuple(range(1, int(os.getenv('SEARCH_PAGES', 3)) + 1))
+
+    @staticmethod
+    def get_photo_cache_max_bytes() -> int:
+        """Метод возвращает максимальный объем (в байтах) фото товаров, которые хранятся в памяти."""
+        return int(os.getenv('PHOTO_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+    @staticmethod
+    def get_photo_disk_max_bytes() -> int:
+        """Метод возвращает максимальный объем (в байтах) фото товаров, которые хранятся на диске."""
+        return int(os.getenv('PHOTO_DISK_MAX_BYTES', 512 * 1024 * 1024))
+
+    @staticmethod
+    def get_prefetch_distance() -> int:
+        """
+        Метод возвращает кол-во оставшихся загруженных товаров, при котором в фоне загружается
+        следующая страница результатов /high.
+        """
+        return int(os.getenv('PREFETCH_DISTANCE', 3))
+
+    @staticmethod
+    def get_photo_max_side() -> int:
+        """
+        Метод возвращает максимальный размер (в пикселях) большей стороны фото товара перед кешированием и отправкой,
+        0 - фото не уменьшаются.
+        """
+        return int(os.getenv('PHOTO_MAX_SIDE', 1280))
+
+    @staticmethod
+    def get_photo_jpeg_quality() -> int:
+        """Метод возвращает качество JPEG уменьшенных фото товаров."""
+        return int(os.getenv('PHOTO_JPEG_QUALITY', 85))
+
+    @staticmethod
+    def get_photo_delivery_mode() -> str:
+        """
+        Метод возвращает способ отправки фото товаров: 'url' - ссылкой, Telegram загружает фото сам,
+        'upload' - фото загружается ботом и отправляется байтами.
+        """
+        return os.getenv('PHOTO_DELIVERY_MODE', 'url').strip().lower()
+
+    @staticmethod
+    def get_photo_url_retry() -> float:
+        """
+        Метод возвращает время (в секундах), в течение которого фото с домена, ссылку с которого Telegram
+        не принял, отправляются байтами.
+        """
+        return float(os.getenv('PHOTO_URL_RETRY', 60 * 60))
+
+    @staticmethod
+    def get_photo_prefetch_count() -> int:
+        """Метод возвращает кол-во следующих товаров, фото которых загружаются в фоне во время просмотра."""
+        return int(os.getenv('PHOTO_PREFETCH_COUNT', 3))
+
+    @staticmethod
+    def get_photo_prefetch_workers() -> int:
+        """Метод возвращает кол-во потоков фоновой загрузки фото."""
+        return max(1, int(os.getenv('PHOTO_PREFETCH_WORKERS', 4)))
+
+    @staticmethod
+    def get_cache_ttl() -> float:
+        """Метод возвращает время (в секундах), в течение которого результат запроса считается актуальным."""
+        return float(os.getenv('CACHE_TTL', 6 * 60 * 60))
+
+    @staticmethod
+    def get_result_cache_max_bytes() -> int:
+        """Метод возвращает максимальный объем (в байтах) результатов, которые хранятся в памяти."""
+        return int(os.getenv('RESULT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+    @staticmethod
+    def get_result_cache_ttl() -> float:
+        """Метод возвращает время (в секундах) хранения результата в памяти."""
+        return float(os.getenv('RESULT_CACHE_TTL', 10 * 60))
+
+    @staticmethod
+    def get_result_cache_negative_ttl() -> float:
+        """Метод возвращает время (в секундах) хранения пустого результата в памяти."""
+        return float(os.getenv('RESULT_CACHE_NEGATIVE_TTL', 60))
+
+    @staticmethod
+    def get_cache_compress() -> bool:
+        """Метод возвращает True, если результаты в хранилище необходимо сжимать."""
+        return os.getenv('CACHE_COMPRESS', 'true').lower() in ('1', 'true', 'yes')
+
+    @staticmethod
+    def get_refresh_workers() -> int:
+        """Метод возвращает кол-во потоков, которые обновляют устаревшие результаты в фоне."""
+        return int(os.getenv('CACHE_REFRESH_WORKERS', 2))
+
+    @staticmethod
+    def get_query_synonyms_path() -> Optional[str]:
+        """Метод возвращает путь к json файлу таблицы синонимов запросов {"айфон": "iphone", ...} или None."""
+        return os.getenv('QUERY_SYNONYMS') or None
+
+    @staticmethod
+    def get_query_token_match() -> bool:
+        """Метод возвращает True, если запросы с одинаковым набором слов считаются одним запросом."""
+        return os.getenv('QUERY_TOKEN_MATCH', 'true').lower() in ('1', 'true', 'yes')
+
+    @staticmethod
+    def get_query_known_max() -> int:
+        """Метод возвращает лимит кол-ва запомненных запросов для сопоставления по набору слов."""
+        return int(os.getenv('QUERY_KNOWN_MAX', 5000))
+
+    @staticmethod
+    def get_prewarm_interval() -> float:
+        """Метод возвращает интервал (в секундах) между прогревами кеша популярными запросами."""
+        return float(os.getenv('PREWARM_INTERVAL', 60 * 60))
+
+    @staticmethod
+    def get_prewarm_days() -> int:
+        """Метод возвращает кол-во последних дней истории, по которым выбираются популярные запросы."""
+        return int(os.getenv('PREWARM_DAYS', 3))
+
+    @staticmethod
+    def get_prewarm_queries() -> int:
+        """Метод возвращает кол-во популярных запросов, которые прогреваются за один раз."""
+        return int(os.getenv('PREWARM_QUERIES', 20))
+
+    @staticmethod
+    def get_prewarm_budget() -> int:
+        """Метод возвращает максимальное кол-во запросов к API за один прогрев кеша."""
+        return int(os.getenv('PREWARM_BUDGET', 30))
+
+    @staticmethod
+    def get_prewarm_photos() -> int:
+        """Метод возвращает кол-во фото первых товаров каждого запроса, которые загружаются при прогреве."""
+        return int(os.getenv('PREWARM_PHOTOS', 3))
+
     @classmethod
     def get_path_for_json_dir(cls) -> str:
         """Возвращает путь к кэш-файлу"""
         return cls.__path_of_requests_dir
 
     @classmethod
-    def check_path(cls, path: str) -> bool:
-        """
-        Проверка файла перед его чтением.
-        Returns:
-            bool: В случае отсутствия файла в директории будет возвращено False, иначе True.
-        """
-        if os.path.exists(path):
-            return True
-        return False
+    def get_path_result_store(cls) -> str:
+        """Возвращает путь к файлу хранилища результатов запросов."""
+        return cls.__path_of_result_store
+
+    @classmethod
+    def get_path_photo_dir(cls) -> str:
+        """Возвращает путь к директории кеша фото на диске."""
+        return os.getenv('PHOTO_DISK_DIR') or cls.__path_of_photo_dir
 
     @classmethod
     def check_log_file(cls) -> str | Optional[None]:
@@ -121,35 +304,43 @@ class Setting(abc.ABC):
             return []
 
     @classmethod
-    def get_limit_folders(cls) -> int:
-        """Метод возвращает настройки лимита временных файлов"""
-        return cls.__max_count_files
+    def get_cache_max_entries(cls) -> int:
+        """Метод возвращает лимит кол-ва результатов в хранилище результатов запросов."""
+        return int(os.getenv('CACHE_MAX_ENTRIES', cls.__max_count_results))
+
+    @staticmethod
+    def get_cache_max_bytes() -> int:
+        """Метод возвращает лимит суммарного размера результатов в хранилище (в байтах)."""
+        return int(os.getenv('CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+    @staticmethod
+    def get_cache_evict_interval() -> float:
+        """Метод возвращает интервал (в секундах) проверки лимитов хранилища результатов."""
+        return float(os.getenv('CACHE_EVICT_INTERVAL', 60))
+
+    @staticmethod
+    def get_cache_evict_batch() -> int:
+        """Метод возвращает максимальное кол-во результатов, удаляемых из хранилища за один проход."""
+        return int(os.getenv('CACHE_EVICT_BATCH', 100))
+
+    @staticmethod
+    def get_cache_compact_bytes() -> int:
+        """Метод возвращает объем свободного места в файле хранилища (в байтах), при котором он сжимается."""
+        return int(os.getenv('CACHE_COMPACT_BYTES', 64 * 1024 * 1024))
 
     @classmethod
-    def sorted_list_dir(cls, dir_list: list) -> OSError | int:
+    def remove_files_requests(cls, dir_list: list) -> OSError | int:
         """
-        Метод для удаления временных файлов.
-        Временные файлы /api_site/utils/requests/ выполняют роль кеша при обращении пользователем
-        к его поисковой истории запросов к API. В случае их избыточного кол-ва часть из них будет удалена.
+        Метод для удаления временных файлов из папки кеша.
 
         Params:
             dir_list (list): список временных файлов.
 
         Return:
             OSError | int в случае успешной операции возвращает кол-во удаленных файлов. Иначе возвращает ошибку.
-
-        Raise:
-            OSError: в случае не успеха удаления временных файлов.
-
-        Notes:
-        Метод сортирует список временных файлов, после чего создается индекс среза.
-        В данном срезе средствами цикла for происходит удаление всех файлов которые оказались внутри среза.
-        В
         """
-        sorted_date_files: List[str] = sorted(dir_list, key=lambda x: os.path.getatime(cls.__path_of_requests_dir))
         count: int = 0
-        slice_: int = int(cls.__max_count_files * 0.6)
-        for file in sorted_date_files[slice_:]:
+        for file in dir_list:
             path: str = f'{cls.__path_of_requests_dir}/{file}'
             try:
                 os.remove(path)
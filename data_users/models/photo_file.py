@@ -0,0 +1,19 @@
+from peewee import AutoField, CharField, TextField
+
+from data_users.models.basemodel import BaseModel
+
+
+class PhotoFile(BaseModel):
+    """
+    Класс дочерний от BaseModel. Атрибуты класса создают поля в БД.
+
+    Attribute:
+        ID: Уникальный номер записи в таблице.
+        link_hash: sha1 ссылки на изображение, по нему выполняется поиск.
+        link: Ссылка на изображение.
+        file_id: Идентификатор файла, который вернул Telegram после первой отправки изображения.
+    """
+    ID = AutoField(primary_key=True)
+    link_hash = CharField(max_length=40, unique=True)
+    link = TextField()
+    file_id = CharField()
@@ -1,9 +1,10 @@
-from typing import List
-from peewee import DoesNotExist
+from typing import List, Tuple
+from peewee import DoesNotExist, fn
 from data_users.models.basemodel import db
 from data_users.models.basemodel import BaseModel
 from data_users.models.favorite import Favorite
 from data_users.models.history import History
+from data_users.models.photo_file import PhotoFile
 from data_users.models.user_tg import UserTg
 from common_utils import logger
 
@@ -15,6 +16,8 @@ class WriteAndReadData:
     Methods:
         write_db (): Получает данные и записывает их.
         read_db (): Возвращает историю запросов.
+        read_popular_requests (): Возвращает самые частые запросы всех пользователей.
+        photo_file_write (), photo_file_read (), photo_file_delete (): Работа с file_id изображений Telegram.
 
     Notes:
         Класс обращается к базам данным и выполняет чтение/запись/ удаление из БД.
@@ -92,6 +95,27 @@ class WriteAndReadData:
                 return history[:10]
             return history
 
+    @staticmethod
+    def read_popular_requests(since: str, limit: int) -> List[Tuple[str, str, int]]:
+        """
+        Метод возвращает самые частые поисковые запросы всех пользователей.
+
+        Params:
+            since (str): Учитываются запросы с этой даты (формат "%Y.%m.%d %H:%M", как в History.date).
+            limit (int): Максимальное кол-во запросов.
+
+        Returns:
+            List[Tuple[str, str, int]]: Запрос, метод и кол-во таких запросов, по убыванию кол-ва.
+        """
+        count = fn.COUNT(History.ID)
+        with db.atomic():
+            query = (History.select(History.request, History.method, count.alias('count'))
+                     .where(History.date >= since)
+                     .group_by(History.request, History.method)
+                     .order_by(count.desc())
+                     .limit(limit))
+            return [(story.request, story.method, story.count) for story in query]
+
     @staticmethod
     def favorite_db_write(id_user: int, link_foto: str, about: str, link_web: str) -> None:
         """
@@ -151,3 +175,38 @@ class WriteAndReadData:
             except Favorite.DoesNotExist:
                 logger.debug(f'Не успешная попытка удалить объект из таблицы:'
                              f' {Favorite.DoesNotExist}, {id_user=}, {link=}')
+
+    @staticmethod
+    def photo_file_write(link_hash: str, link: str, file_id: str) -> None:
+        """
+        Метод сохраняет file_id изображения, заменяя ранее сохраненный.
+        Args:
+            link_hash: sha1 ссылки на изображение.
+            link: Ссылка на изображение.
+            file_id: Идентификатор файла Telegram.
+        """
+        with db.atomic():
+            PhotoFile.replace(link_hash=link_hash, link=link, file_id=file_id).execute()
+
+    @staticmethod
+    def photo_file_read(link_hash: str) -> str | None:
+        """
+        Метод возвращает file_id изображения.
+        Args:
+            link_hash: sha1 ссылки на изображение.
+        Returns:
+            str | None: file_id, None если изображение еще не отправлялось.
+        """
+        with db.atomic():
+            photo: PhotoFile | None = PhotoFile.get_or_none(PhotoFile.link_hash == link_hash)
+            return photo.file_id if photo is not None else None
+
+    @staticmethod
+    def photo_file_delete(link_hash: str) -> None:
+        """
+        Метод удаляет file_id изображения, который Telegram больше не принимает.
+        Args:
+            link_hash: sha1 ссылки на изображение.
+        """
+        with db.atomic():
+            PhotoFile.delete().where(PhotoFile.link_hash == link_hash).execute()
@@ -1,8 +1,10 @@
 from tg_bot import Bot
+from api_site import start_cache_janitor
 from common_utils import check_status_cache_of_files
 
 if __name__ == '__main__':
     check_status_cache_of_files()
+    start_cache_janitor()  # поддерживает хранилище результатов поиска в пределах лимитов.
     bot = Bot()
     bot.run()  # данных модуль инициализирует запуск бота.
     bot.bot.polling(none_stop=True)
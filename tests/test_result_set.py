@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+from api_site.utils import result_set
+from api_site.utils.result_set import PRICE, ResultSet
+
+
+class _Product:
+    """Товар с минимальным набором свойств, которые использует ResultSet."""
+
+    def __init__(self, price: float) -> None:
+        self.__price: float = price
+
+    def get_price(self) -> float:
+        return self.__price
+
+    def get_product_rating(self) -> float:
+        return 0.0
+
+    def get_store_name(self) -> str:
+        return 'store'
+
+
+PRICES = (10.0, 20.0, 30.0, 30.0, 40.0)
+_NUMPY = result_set.np
+
+
+class FilterRangeWithoutNumpyTest(unittest.TestCase):
+    """Проверка ResultSet.filter_range без NumPy (array и встроенные функции)."""
+
+    def setUp(self) -> None:
+        patcher = mock.patch.object(result_set, 'np', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.result = ResultSet(_Product(price) for price in PRICES)
+
+    def test_open_high_with_exclusive_bound(self) -> None:
+        self.assertEqual(list(self.result.filter_range(PRICE, low=25, high=None, include_high=False)), [2, 3, 4])
+
+    def test_exclusive_high(self) -> None:
+        self.assertEqual(list(self.result.filter_range(PRICE, low=10, high=30, include_high=False)), [0, 1])
+
+    def test_inclusive_high(self) -> None:
+        self.assertEqual(list(self.result.filter_range(PRICE, low=10, high=30)), [0, 1, 2, 3])
+
+    @unittest.skipIf(_NUMPY is None, 'NumPy не установлен')
+    def test_same_as_numpy(self) -> None:
+        with_numpy = ResultSet(_Product(price) for price in PRICES)
+        for low, high, include_high in ((None, 30, False), (20, None, False), (20, 30, True), (None, None, False)):
+            with mock.patch.object(result_set, 'np', _NUMPY):
+                expected = list(with_numpy.filter_range(PRICE, low, high, include_high=include_high))
+            self.assertEqual(list(self.result.filter_range(PRICE, low, high, include_high=include_high)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
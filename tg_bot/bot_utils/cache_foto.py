@@ -1,6 +1,15 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
+
 from api_site.utils.check_time_for_log import decorator_for_check_time
-import requests
+from api_site.getiing_requests.session_http import SessionHTTP
+from common_utils import Setting
+from common_utils import logger
+from tg_bot.bot_utils.image_normalizer import normalize_image
+from tg_bot.bot_utils.photo_disk_cache import PhotoDiskCache
 
 
 class CacheFoto:
@@ -8,32 +17,118 @@ class CacheFoto:
     Базовый класс, предназначен для кеширования фото.
 
     Attributes:
-         __cache_foto: Dict: содержит временные ссылки на загруженные изображения в память.
+         __cache_foto: OrderedDict: Загруженные изображения по хешу ссылки, в порядке последнего обращения (LRU).
+         __max_bytes: int: Максимальный объем изображений в памяти (Setting.get_photo_cache_max_bytes()).
+         __disk: PhotoDiskCache: Кеш изображений на диске, который сохраняется после перезапуска.
+
+    Methods:
+        check_cache(link): Возвращает изображение из кеша или загружает его.
+        in_memory(link): Проверяет, что изображение есть в памяти.
+        get_stats(): Возвращает счетчики кеша.
+
+    Notes:
+        Кеш общий для всех объектов класса и потоков. Одно изображение хранится один раз, независимо от того,
+        в каком описании товара оно используется. При превышении объема удаляются изображения,
+        к которым дольше всего не обращались.
+        Если изображения нет в памяти, оно читается с диска (PhotoDiskCache) и только затем загружается.
+        Загруженное изображение уменьшается (normalize_image), в памяти и на диске хранится уменьшенное изображение.
+        Загруженное изображение сохраняется на диск в отдельном потоке.
     """
-    __cache_foto: Dict = {}
+    __cache_foto: OrderedDict[str, bytes] = OrderedDict()
+    __max_bytes: int = Setting.get_photo_cache_max_bytes()
+    __lock: threading.Lock = threading.Lock()
+    __bytes: int = 0
+    __stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0, 'downloaded_bytes': 0, 'saved_bytes': 0}
+    __disk: PhotoDiskCache = PhotoDiskCache(Setting.get_path_photo_dir(), Setting.get_photo_disk_max_bytes())
+    __writer: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='photo_writer')
+
+    @staticmethod
+    def __get_key(link: str) -> str:
+        """Метод возвращает ключ кеша по ссылке на изображение."""
+        return hashlib.sha1(link.encode('UTF-8')).hexdigest()
 
     @decorator_for_check_time
-    def check_cache(self, pattern: str, link: str) -> bytes:
+    def check_cache(self, link: str) -> bytes:
         """
-        Метод проверяет наличие ссылки в словаре. Если такая имеется в нем, то возвращает изображение.
+        Метод проверяет наличие изображения в кеше. Если оно имеется, то возвращает изображение.
         Иначе будет исполен get запрос, сохраним в памяти изображение и вернем его для дальнейшей обработки.
 
         Args:
-            pattern: Необходимо для поиска в словаре данного запроса.
-            link: Необходима для get запроса.
+            link: Ссылка на изображение.
 
         Returns:
             bytes: Изображения.
 
         Notes:
             Метод снимает нагрузку с сети во время обращения пользователя к новой странице продукта.
-            Что ускорит выдачу готовых результатов. В дальнейшем можно создать лимит словаря, при увеличении нагрузки.
+            Что ускорит выдачу готовых результатов.
         """
+        key: str = self.__get_key(link)
+        with self.__lock:
+            pict: bytes | None = self.__cache_foto.get(key)
+            if pict is not None:
+                self.__cache_foto.move_to_end(key)
+                self.__stats['hits'] += 1
+                return pict
+            self.__stats['misses'] += 1
 
-        if self.__cache_foto.get(pattern):
-            pict = self.__cache_foto.get(pattern)
+        pict: bytes | None = self.__disk.get(key)
+        if pict is not None:
+            self.__put(key, pict)
             return pict
-        else:
-            with requests.get(link) as pict:
-                self.__cache_foto[pattern] = pict.content
-            return pict.content
+
+        with SessionHTTP.get(link) as response:
+            pict: bytes = response.content
+            ok: bool = response.ok
+        if ok:
+            original: int = len(pict)
+            pict = normalize_image(pict)
+            with self.__lock:
+                self.__stats['downloaded_bytes'] += original
+                self.__stats['saved_bytes'] += original - len(pict)
+            self.__put(key, pict)
+            self.__writer.submit(self.__write_disk, key, pict)
+        return pict
+
+    @classmethod
+    def in_memory(cls, link: str) -> bool:
+        """Метод проверяет, что изображение есть в памяти, не меняя порядок вытеснения и счетчики."""
+        with cls.__lock:
+            return cls.__get_key(link) in cls.__cache_foto
+
+    @classmethod
+    def __write_disk(cls, key: str, pict: bytes) -> None:
+        """Метод сохраняет изображение на диск (выполняется в потоке записи)."""
+        try:
+            cls.__disk.put(key, pict)
+        except Exception as err:
+            logger.error(f'tg_bot/bot_utils/cache_foto.py Не удалось сохранить фото на диск: {err=}')
+
+    @classmethod
+    def __put(cls, key: str, pict: bytes) -> None:
+        """Метод сохраняет изображение и удаляет давно не используемые изображения сверх объема кеша."""
+        if len(pict) > cls.__max_bytes:
+            return
+        with cls.__lock:
+            old: bytes | None = cls.__cache_foto.pop(key, None)
+            if old is not None:
+                cls.__bytes -= len(old)
+            cls.__cache_foto[key] = pict
+            cls.__bytes += len(pict)
+            while cls.__bytes > cls.__max_bytes:
+                _, evicted = cls.__cache_foto.popitem(last=False)
+                cls.__bytes -= len(evicted)
+                cls.__stats['evictions'] += 1
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, int | float | Dict]:
+        """
+        Метод возвращает счетчики кеша.
+        Returns:
+            Dict: hits, misses, hit_rate, evictions, entries, bytes - кеш в памяти,
+                downloaded_bytes - загружено, saved_bytes - сэкономлено уменьшением фото, disk - счетчики кеша на диске.
+        """
+        with cls.__lock:
+            requests: int = cls.__stats['hits'] + cls.__stats['misses']
+            return dict(cls.__stats, hit_rate=round(cls.__stats['hits'] / requests, 4) if requests else 0.0,
+                        entries=len(cls.__cache_foto), bytes=cls.__bytes, disk=cls.__disk.get_stats())
@@ -0,0 +1,64 @@
+import io
+from typing import Tuple
+
+from common_utils import Setting
+from common_utils import logger
+
+try:  # Pillow необязателен: без него изображения отправляются без изменений.
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+
+def is_available() -> bool:
+    """Функция возвращает True, если Pillow установлен и изображения уменьшаются."""
+    return Image is not None and Setting.get_photo_max_side() > 0
+
+
+def _to_rgb(image) -> 'Image.Image':
+    """Функция приводит изображение к RGB, прозрачный фон заменяется белым."""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB') if image.mode != 'RGB' else image
+
+
+def normalize_image(pict: bytes) -> bytes:
+    """
+    Функция уменьшает изображение до Setting.get_photo_max_side() пикселей по большей стороне
+    и сохраняет его в JPEG с качеством Setting.get_photo_jpeg_quality().
+    Params:
+        pict (bytes): Исходное изображение.
+    Returns:
+        bytes: Уменьшенное изображение или исходное, если Pillow не установлен, изображение не удалось
+            прочитать, оно анимировано, это JPEG не больше нужного размера или результат получился
+            не меньше исходного.
+    Notes:
+        Telegram все равно пережимает фото, поэтому исходное изображение в несколько мегабайт только
+        увеличивает объем загрузки и кеша. JPEG уменьшается еще при чтении (Image.draft),
+        что бы не декодировать изображение в полном размере.
+    """
+    max_side: int = Setting.get_photo_max_side()
+    if Image is None or max_side <= 0 or not pict:
+        return pict
+    try:
+        with Image.open(io.BytesIO(pict)) as image:
+            if getattr(image, 'is_animated', False):
+                return pict
+            size: Tuple[int, int] = image.size
+            if image.format == 'JPEG' and max(size) <= max_side:
+                return pict  # JPEG нужного размера: повторное сжатие только ухудшит качество.
+            image.draft('RGB', (max_side, max_side))
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_side, max_side), Image.LANCZOS)
+            buffer = io.BytesIO()
+            _to_rgb(image).save(buffer, format='JPEG', quality=Setting.get_photo_jpeg_quality(),
+                                optimize=True, progressive=True)
+    except Exception as err:  # Pillow вызывает разные исключения для поврежденных и неизвестных форматов.
+        logger.debug(f'tg_bot/bot_utils/image_normalizer.py Изображение не уменьшено: {err=}')
+        return pict
+    result: bytes = buffer.getvalue()
+    return result if len(result) < len(pict) else pict
@@ -1,7 +1,8 @@
-from typing import List
+import hashlib
+from typing import List, Tuple
 
 from data_users import db
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from data_users.models.basemodel import BaseModel
 
@@ -9,7 +10,7 @@ from data_users.models.basemodel import BaseModel
 class ManagerDB:
 
     @staticmethod
-    def write_db_story(id_user: int, message, param: bool, sort: bool) -> None:
+    def write_db_story(id_user: int, message, param: bool, sort: bool | str) -> None:
         """
         Метод записывает данные об активности пользователя.
         Args:
@@ -30,6 +31,8 @@ class ManagerDB:
             method: str = f'down /custom'
         elif param is None and sort is None:
             method: str = f'def /custom'
+        elif param is None and sort == 'rating':
+            method: str = f'rating /custom'
         elif param is False:
             method: str = f'one /low'
         elif param is True:
@@ -86,6 +89,20 @@ class ManagerDB:
         history: List[BaseModel] = db.read_db(id_user=id_user)
         return history
 
+    @staticmethod
+    def read_popular_requests(days: int, limit: int) -> List[Tuple[str, str, int]]:
+        """
+        Метод возвращает самые частые поисковые запросы всех пользователей за последние дни.
+        Args:
+            days: Кол-во последних дней.
+            limit: Максимальное кол-во запросов.
+        Returns:
+            List[Tuple[str, str, int]]: Запрос, метод (как в History.method) и кол-во таких запросов.
+        """
+
+        since: str = (datetime.now() - timedelta(days=days)).strftime("%Y.%m.%d %H:%M")
+        return db.read_popular_requests(since=since, limit=limit)
+
     @staticmethod
     def del_favorite(id_user: int, link: str) -> None:
         """
@@ -100,3 +117,45 @@ class ManagerDB:
         """
 
         db.del_favorite(id_user=id_user, link=link)
+
+    @staticmethod
+    def __get_link_hash(link: str) -> str:
+        """Метод возвращает sha1 ссылки на изображение."""
+        return hashlib.sha1(link.encode('UTF-8')).hexdigest()
+
+    @staticmethod
+    def write_photo_file(link: str, file_id: str) -> None:
+        """
+        Метод сохраняет file_id изображения, полученный от Telegram после первой отправки.
+        Args:
+            link: Ссылка на изображение.
+            file_id: Идентификатор файла Telegram.
+        Returns:
+            None
+        """
+
+        db.photo_file_write(link_hash=ManagerDB.__get_link_hash(link), link=link, file_id=file_id)
+
+    @staticmethod
+    def read_photo_file(link: str) -> str | None:
+        """
+        Метод возвращает file_id изображения.
+        Args:
+            link: Ссылка на изображение.
+        Returns:
+            str | None: file_id, None если изображение еще не отправлялось.
+        """
+
+        return db.photo_file_read(link_hash=ManagerDB.__get_link_hash(link))
+
+    @staticmethod
+    def del_photo_file(link: str) -> None:
+        """
+        Метод удаляет file_id изображения.
+        Args:
+            link: Ссылка на изображение.
+        Returns:
+            None
+        """
+
+        db.photo_file_delete(link_hash=ManagerDB.__get_link_hash(link))
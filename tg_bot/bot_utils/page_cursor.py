@@ -0,0 +1,126 @@
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set
+
+from api_site import main as get_api
+from api_site.utils.product_obj import Product
+from common_utils import Setting
+from common_utils import logger
+
+
+class PageCursor(Sequence):
+    """
+    Ленивый список товаров запроса, который загружает страницы результатов API по мере просмотра.
+
+    Methods:
+        __getitem__(index): Возвращает товар и при необходимости загружает следующую страницу.
+        __len__(): Возвращает кол-во загруженных товаров.
+        __iter__(): Обходит загруженные товары.
+        has_more(): Возвращает True, если за загруженными товарами могут быть еще товары.
+        has_item(index): Проверяет, что товар index существует, при необходимости загружая следующую страницу.
+
+    Notes:
+        При создании загружается только первая страница. Когда пользователь доходит до товара, после которого
+        загружено не более Setting.get_prefetch_distance() товаров, следующая страница загружается в фоне,
+        поэтому страницы, до которых пользователь не дошел, не запрашиваются. Каждая страница запрашивается
+        через api_site.main() и кешируется по своему ключу. Товары, которые уже были на предыдущих страницах,
+        пропускаются. Пустая страница или страница без новых товаров означает конец результатов.
+        Если страницу не удалось загрузить (ошибка запроса, API недоступен), она будет запрошена снова
+        при следующем обращении.
+    """
+    __executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='page_cursor')
+
+    def __init__(self, method: str, product: str, first_page: int = 1, **kwargs) -> None:
+        """
+        Params:
+            method (str): Тип запроса к API.
+            product (str): Название товара.
+            first_page (int): Номер первой страницы.
+            **kwargs: Остальные параметры запроса (country, language).
+        """
+        self.__method: str = method
+        self.__product: str = product
+        self.__kwargs: Dict = kwargs
+        self.__next_page: int = first_page
+        self.__items: List[Product] = []
+        self.__seen: Set[str] = set()
+        self.__exhausted: bool = False
+        self.__lock: threading.Lock = threading.Lock()
+        self.__loading: Optional[Future] = None
+        self.__load_next()
+
+    def __load_next(self) -> bool:
+        """
+        Метод загружает следующую страницу результатов.
+        Returns:
+            bool: False, если результаты закончились или страницу не удалось загрузить.
+        """
+        with self.__lock:
+            if self.__exhausted:
+                return False
+            page: int = self.__next_page
+            self.__next_page += 1
+        try:
+            result: List[Product] | None = get_api(method=self.__method, product=self.__product, page=page,
+                                                   **self.__kwargs)
+        except Exception as err:
+            logger.error(f'tg_bot/bot_utils/page_cursor.py Не удалось загрузить страницу {page}: {err=}')
+            result = None
+        with self.__lock:
+            if result is None:  # ошибка запроса или API недоступен: страница будет запрошена повторно.
+                self.__next_page = min(self.__next_page, page)
+                logger.debug(f'Страница {page} запроса {self.__product!r} не загружена')
+                return False
+            new_items: List[Product] = [any_product for any_product in result
+                                        if any_product.get_product_id() not in self.__seen]
+            if not new_items:
+                self.__exhausted = True
+                logger.debug(f'Результаты запроса {self.__product!r} закончились на странице {page}')
+                return False
+            self.__seen.update(any_product.get_product_id() for any_product in new_items)
+            self.__items.extend(new_items)
+            return True
+
+    def __ensure(self, index: int) -> None:
+        """
+        Метод загружает следующую страницу: сразу, если товара index еще нет,
+        и в фоне, если до конца загруженных товаров осталось не более Setting.get_prefetch_distance().
+        """
+        loading: Optional[Future] = self.__loading
+        if index >= len(self.__items):
+            if loading is not None:
+                loading.result()
+            while index >= len(self.__items) and self.__load_next():
+                pass
+        elif (len(self.__items) - 1 - index <= Setting.get_prefetch_distance() and not self.__exhausted
+              and (loading is None or loading.done())):
+            self.__loading = self.__executor.submit(self.__load_next)
+
+    def __getitem__(self, index: int) -> Product:
+        if isinstance(index, slice):
+            return self.__items[index]
+        if index < 0:
+            return self.__items[index]
+        self.__ensure(index)
+        return self.__items[index]
+
+    def __iter__(self) -> Iterator[Product]:
+        """Обход только загруженных товаров, без загрузки новых страниц."""
+        return iter(list(self.__items))
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def has_item(self, index: int) -> bool:
+        """
+        Метод проверяет, что товар index существует: если он еще не загружен, загружается следующая страница.
+        Returns:
+            bool: False, если результаты закончились до товара index или страницу не удалось загрузить.
+        """
+        self.__ensure(index)
+        return index < len(self.__items)
+
+    def has_more(self) -> bool:
+        """Метод возвращает True, если за загруженными товарами могут быть еще товары."""
+        return not self.__exhausted
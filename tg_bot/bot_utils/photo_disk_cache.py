@@ -0,0 +1,134 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from common_utils import logger
+
+# Заголовок файла: сигнатура, sha256 изображения и его размер.
+_MAGIC: bytes = b'PHC1'
+_HEADER: struct.Struct = struct.Struct('>4s32sQ')
+
+
+class PhotoDiskCache:
+    """
+    Класс хранит изображения на диске, что бы после перезапуска бота они не загружались повторно.
+
+    Methods:
+        get(key): Возвращает изображение или None.
+        put(key, pict): Сохраняет изображение.
+        get_stats(): Возвращает счетчики.
+
+    Notes:
+        Файл изображения хранится в директории root/<ключ[:2]>/<ключ[2:4]>/<ключ>, что бы в одной директории
+        не было слишком много файлов. Файл содержит заголовок с sha256 и размером изображения: файл,
+        который не прошел проверку (например, после прерванной записи), удаляется.
+        Чтение выполняется через mmap: проверка sha256 выполняется по отображенному в память файлу,
+        а изображение копируется из него один раз.
+        Общий объем файлов ограничен max_bytes, при превышении удаляются файлы, к которым дольше всего
+        не обращались. Запись выполняется во временный файл с последующим переименованием.
+    """
+
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.__root: str = root
+        self.__max_bytes: int = max_bytes
+        self.__lock: threading.Lock = threading.Lock()
+        self.__index: OrderedDict[str, int] = OrderedDict()
+        self.__bytes: int = 0
+        self.__stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0, 'corrupted': 0}
+        self.__load_index()
+
+    def __get_path(self, key: str) -> str:
+        """Метод возвращает путь к файлу изображения."""
+        return os.path.join(self.__root, key[:2], key[2:4], key)
+
+    def __load_index(self) -> None:
+        """Метод находит сохраненные файлы и упорядочивает их по времени последнего обращения."""
+        files: List[Tuple[float, str, int]] = []
+        for directory, _, names in os.walk(self.__root):
+            for name in names:
+                if name.startswith('.'):  # незавершенная запись.
+                    os.remove(os.path.join(directory, name))
+                    continue
+                stat = os.stat(os.path.join(directory, name))
+                files.append((stat.st_mtime, name, stat.st_size))
+        for _, key, size in sorted(files):
+            self.__index[key] = size
+            self.__bytes += size
+        logger.info(f'Кеш фото на диске: {len(self.__index)} файлов, {self.__bytes} байт')
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Метод возвращает изображение по ключу.
+        Returns:
+            bytes | None: Изображение, None если файла нет или он поврежден.
+        """
+        with self.__lock:
+            if key not in self.__index:
+                self.__stats['misses'] += 1
+                return None
+            self.__index.move_to_end(key)
+        path: str = self.__get_path(key)
+        try:
+            with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view, view[_HEADER.size:] as payload:
+                    magic, digest, size = _HEADER.unpack_from(view)
+                    valid: bool = (magic == _MAGIC and size == len(payload)
+                                   and hashlib.sha256(payload).digest() == digest)
+                    pict: bytes | None = payload.tobytes() if valid else None
+            os.utime(path)
+        except (OSError, ValueError, struct.error) as err:
+            logger.debug(f'tg_bot/bot_utils/photo_disk_cache.py Не удалось прочитать {path}: {err=}')
+            pict = None
+        with self.__lock:
+            if pict is None:
+                self.__stats['corrupted'] += 1
+                self.__stats['misses'] += 1
+                self.__remove(key)
+            else:
+                self.__stats['hits'] += 1
+        return pict
+
+    def put(self, key: str, pict: bytes) -> None:
+        """Метод сохраняет изображение и удаляет давно не используемые файлы сверх объема кеша."""
+        size: int = _HEADER.size + len(pict)
+        if size > self.__max_bytes:
+            return
+        path: str = self.__get_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, temp_path = tempfile.mkstemp(prefix='.', dir=os.path.dirname(path))
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(_HEADER.pack(_MAGIC, hashlib.sha256(pict).digest(), len(pict)))
+                file.write(pict)
+            os.replace(temp_path, path)
+        except OSError as err:
+            logger.error(f'tg_bot/bot_utils/photo_disk_cache.py Не удалось сохранить {path}: {err=}')
+            return
+        with self.__lock:
+            self.__bytes += size - self.__index.pop(key, 0)
+            self.__index[key] = size
+            while self.__bytes > self.__max_bytes:
+                self.__remove(next(iter(self.__index)))
+                self.__stats['evictions'] += 1
+
+    def __remove(self, key: str) -> None:
+        """Метод удаляет файл изображения (вызывается под блокировкой)."""
+        self.__bytes -= self.__index.pop(key, 0)
+        try:
+            os.remove(self.__get_path(key))
+        except OSError:
+            pass
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Метод возвращает счетчики.
+        Returns:
+            Dict: hits, misses, evictions, corrupted - удаленные поврежденные файлы, entries, bytes.
+        """
+        with self.__lock:
+            return dict(self.__stats, entries=len(self.__index), bytes=self.__bytes)
@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from common_utils import Setting
+from common_utils import logger
+from tg_bot.bot_utils.cache_foto import CacheFoto
+
+
+class PhotoPrefetcher:
+    """
+    Класс заранее загружает в кеш фото следующих товаров, пока пользователь просматривает текущий.
+
+    Methods:
+        schedule(chat_id, links): Загружает фото в фоне, отменяя прежнюю загрузку чата.
+        cancel(chat_id): Отменяет загрузку фото чата.
+        get_stats(): Возвращает счетчики.
+
+    Notes:
+        Загрузка выполняется в пуле из Setting.get_photo_prefetch_workers() потоков, общем для всех чатов.
+        У каждого чата есть номер поколения: новая загрузка или выход из списка товаров увеличивает его,
+        задачи прежнего поколения, которые еще не начались, отменяются, а начавшиеся не сохраняют результат
+        повторно. Фото, которое уже есть в памяти, загружается другим чатом или не нужно (skip), пропускается.
+        Загрузка выполняется только если Setting.get_photo_delivery_mode() == 'upload': в режиме 'url'
+        фото отправляются ссылкой и Telegram загружает их сам, поэтому кеш фото им не нужен.
+    """
+
+    def __init__(self, cache_foto: CacheFoto, skip: Optional[Callable[[str], bool]] = None) -> None:
+        """
+        Params:
+            cache_foto (CacheFoto): Кеш фото.
+            skip (Callable | None): Функция, которая возвращает True, если фото загружать не нужно
+                (например, у него уже есть file_id Telegram или оно отправляется ссылкой).
+        """
+        self.__cache_foto: CacheFoto = cache_foto
+        self.__skip: Optional[Callable[[str], bool]] = skip
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=Setting.get_photo_prefetch_workers(),
+                                                                 thread_name_prefix='photo_prefetch')
+        self.__lock: threading.Lock = threading.Lock()
+        self.__generation: Dict[int, int] = {}
+        self.__futures: Dict[int, List[Tuple[Future, str]]] = {}
+        self.__in_flight: Set[str] = set()
+        self.__stats: Dict[str, int] = {'scheduled': 0, 'loaded': 0, 'skipped': 0, 'cancelled': 0, 'errors': 0}
+
+    def schedule(self, chat_id: int, links: Iterable[str]) -> None:
+        """
+        Метод загружает фото в фоне и отменяет задачи, которые чат поставил ранее и которые еще не начались.
+        Params:
+            chat_id (int): Чат пользователя.
+            links (Iterable[str]): Ссылки на фото следующих товаров.
+        """
+        with self.__lock:
+            generation: int = self.__cancel(chat_id)
+            futures: List[Tuple[Future, str]] = []
+            if Setting.get_photo_delivery_mode() != 'upload':  # фото отправляются ссылкой, загружать нечего.
+                links = ()
+            for link in links:
+                if not link or link in self.__in_flight or self.__cache_foto.in_memory(link):
+                    continue
+                self.__in_flight.add(link)
+                self.__stats['scheduled'] += 1
+                futures.append((self.__executor.submit(self.__load, chat_id, generation, link), link))
+            self.__futures[chat_id] = futures
+
+    def cancel(self, chat_id: int) -> None:
+        """Метод отменяет загрузку фото чата, например, когда пользователь вышел из списка товаров."""
+        with self.__lock:
+            self.__cancel(chat_id)
+            self.__futures.pop(chat_id, None)
+
+    def __cancel(self, chat_id: int) -> int:
+        """Метод отменяет задачи чата и возвращает номер нового поколения (вызывается под блокировкой)."""
+        for future, link in self.__futures.get(chat_id, ()):
+            if future.cancel():
+                self.__in_flight.discard(link)
+                self.__stats['cancelled'] += 1
+        generation: int = self.__generation.get(chat_id, 0) + 1
+        self.__generation[chat_id] = generation
+        return generation
+
+    def __is_current(self, chat_id: int, generation: int) -> bool:
+        """Метод проверяет, что задача не отменена новой загрузкой или выходом из списка."""
+        with self.__lock:
+            return self.__generation.get(chat_id) == generation
+
+    def __load(self, chat_id: int, generation: int, link: str) -> None:
+        """Метод загружает фото в кеш (выполняется в пуле потоков)."""
+        try:
+            if not self.__is_current(chat_id, generation):
+                with self.__lock:
+                    self.__stats['cancelled'] += 1
+                return
+            if self.__skip is not None and self.__skip(link):
+                with self.__lock:
+                    self.__stats['skipped'] += 1
+                return
+            self.__cache_foto.check_cache(link=link)
+            with self.__lock:
+                self.__stats['loaded'] += 1
+        except Exception as err:
+            logger.debug(f'tg_bot/bot_utils/photo_prefetch.py Не удалось загрузить фото {link}: {err=}')
+            with self.__lock:
+                self.__stats['errors'] += 1
+        finally:
+            with self.__lock:
+                self.__in_flight.discard(link)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Метод возвращает счетчики.
+        Returns:
+            Dict: scheduled, loaded, skipped - фото, которые не нужно загружать, cancelled, errors, in_flight.
+        """
+        with self.__lock:
+            return dict(self.__stats, in_flight=len(self.__in_flight))
@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import telebot
+
+from common_utils import Setting
+from common_utils import logger
+from tg_bot.bot_utils.cache_foto import CacheFoto
+from tg_bot.bot_utils.manager_db_util import ManagerDB
+
+# Описания ошибок Telegram, после которых сохраненный file_id больше не действителен.
+_FILE_ID_ERRORS: Tuple[str, ...] = ('wrong file identifier', 'file reference expired')
+# Описания ошибок Telegram, когда он не смог загрузить изображение по ссылке или не принял его содержимое.
+_URL_ERRORS: Tuple[str, ...] = ('failed to get http url content', 'wrong type of the web page content',
+                                'wrong file identifier/http url specified')
+
+
+def _is_error(err: telebot.apihelper.ApiTelegramException, markers: Tuple[str, ...]) -> bool:
+    """Функция проверяет, что описание ошибки Telegram содержит одну из строк markers."""
+    description: str = str(err.description).lower()
+    return any(marker in description for marker in markers)
+
+
+class PhotoSender:
+    """
+    Класс отправляет изображения пользователю, повторно используя file_id, который Telegram вернул
+    при первой отправке изображения.
+
+    Methods:
+        send(chat_id, link, caption, reply_markup, load): Отправляет изображение.
+        has_file_id(link): Проверяет, что изображение уже отправлялось.
+        needs_bytes(link): Проверяет, что для отправки изображения понадобятся его байты.
+        get_stats(): Возвращает счетчики.
+
+    Notes:
+        Первая отправка изображения загружает его байты в Telegram, file_id из ответа сохраняется в памяти
+        и в БД (таблица PhotoFile), поэтому после перезапуска бота изображение тоже не загружается повторно.
+        Если Telegram ответил, что сохраненный file_id недействителен, он удаляется, а изображение загружается
+        заново. Остальные ошибки Telegram передаются вызывающему коду.
+        Если Setting.get_photo_delivery_mode() == 'url', изображение, которого еще нет в Telegram, отправляется
+        ссылкой и Telegram сам загружает его. Если Telegram не смог загрузить изображение по ссылке или не принял
+        его содержимое, оно загружается через CacheFoto, а домен ссылки на Setting.get_photo_url_retry() секунд
+        запоминается как недоступный и изображения с него сразу загружаются через CacheFoto.
+        Остальные ошибки отправки ссылкой передаются вызывающему коду.
+    """
+    __max_entries: int = 10000  # file_id в памяти, остальные читаются из БД.
+
+    def __init__(self, bot: telebot.TeleBot, cache_foto: CacheFoto) -> None:
+        self.__bot: telebot.TeleBot = bot
+        self.__cache_foto: CacheFoto = cache_foto
+        self.__file_ids: OrderedDict[str, str] = OrderedDict()
+        self.__lock: threading.Lock = threading.Lock()
+        self.__bad_domains: Dict[str, float] = {}  # домен: время, до которого ссылки с него не отправляются.
+        self.__stats: Dict[str, int] = {'reused': 0, 'uploaded': 0, 'expired': 0, 'by_url': 0, 'url_failed': 0}
+
+    def __get_file_id(self, link: str) -> Optional[str]:
+        """Метод возвращает сохраненный file_id изображения."""
+        with self.__lock:
+            file_id: Optional[str] = self.__file_ids.get(link)
+            if file_id is not None:
+                self.__file_ids.move_to_end(link)
+                return file_id
+        try:
+            file_id = ManagerDB.read_photo_file(link)
+        except Exception as err:
+            logger.error(f'tg_bot/bot_utils/photo_sender.py Не удалось прочитать file_id: {err=}')
+            return None
+        if file_id is not None:
+            self.__remember(link, file_id)
+        return file_id
+
+    def __remember(self, link: str, file_id: str) -> None:
+        """Метод сохраняет file_id в памяти."""
+        with self.__lock:
+            self.__file_ids[link] = file_id
+            self.__file_ids.move_to_end(link)
+            if len(self.__file_ids) > self.__max_entries:
+                self.__file_ids.popitem(last=False)
+
+    def __forget(self, link: str) -> None:
+        """Метод удаляет file_id, который Telegram не принял."""
+        with self.__lock:
+            self.__file_ids.pop(link, None)
+            self.__stats['expired'] += 1
+        try:
+            ManagerDB.del_photo_file(link)
+        except Exception as err:
+            logger.error(f'tg_bot/bot_utils/photo_sender.py Не удалось удалить file_id: {err=}')
+
+    def has_file_id(self, link: str) -> bool:
+        """Метод проверяет, что у изображения есть сохраненный file_id."""
+        return self.__get_file_id(link) is not None
+
+    @staticmethod
+    def __get_domain(link: str) -> Optional[str]:
+        """Метод возвращает домен ссылки, None если это не ссылка http(s)."""
+        parts = urlsplit(link)
+        return parts.hostname if parts.scheme in ('http', 'https') else None
+
+    def __can_send_url(self, link: str) -> bool:
+        """Метод проверяет, что изображение можно отправить ссылкой."""
+        if Setting.get_photo_delivery_mode() != 'url':
+            return False
+        domain: Optional[str] = self.__get_domain(link)
+        if domain is None:
+            return False
+        with self.__lock:
+            retry_at: Optional[float] = self.__bad_domains.get(domain)
+            if retry_at is None:
+                return True
+            if retry_at > time.monotonic():
+                return False
+            del self.__bad_domains[domain]
+            return True
+
+    def __mark_bad_domain(self, link: str) -> None:
+        """Метод запоминает, что Telegram не смог загрузить изображение с домена ссылки."""
+        domain: Optional[str] = self.__get_domain(link)
+        with self.__lock:
+            self.__bad_domains[domain] = time.monotonic() + Setting.get_photo_url_retry()
+            self.__stats['url_failed'] += 1
+        logger.info(f'Telegram не загружает фото с {domain}, фото загружаются через кеш')
+
+    def needs_bytes(self, link: str) -> bool:
+        """Метод проверяет, что изображение будет отправлено байтами (нет file_id и его нельзя отправить ссылкой)."""
+        return not self.__can_send_url(link) and not self.has_file_id(link)
+
+    def __save_file_id(self, link: str, message: telebot.types.Message) -> None:
+        """Метод сохраняет file_id отправленного изображения."""
+        if not message.photo:
+            return
+        file_id: str = message.photo[-1].file_id
+        self.__remember(link, file_id)
+        try:
+            ManagerDB.write_photo_file(link, file_id)
+        except Exception as err:
+            logger.error(f'tg_bot/bot_utils/photo_sender.py Не удалось сохранить file_id: {err=}')
+
+    def send(self, chat_id: int, link: str, caption: Optional[str] = None, reply_markup=None,
+             load: Optional[Callable[[], bytes]] = None) -> telebot.types.Message:
+        """
+        Метод отправляет изображение по file_id, а если его нет - ссылкой или байтами изображения.
+        Params:
+            chat_id (int): Чат пользователя.
+            link (str): Ссылка на изображение, по ней сохраняется file_id.
+            caption (str | None): Подпись.
+            reply_markup: Клавиатура.
+            load (Callable | None): Функция, которая возвращает байты изображения,
+                по умолчанию изображение загружается по ссылке через CacheFoto.
+        Returns:
+            Message: Отправленное сообщение.
+        """
+        file_id: Optional[str] = self.__get_file_id(link)
+        if file_id is not None:
+            try:
+                message: telebot.types.Message = self.__bot.send_photo(chat_id, file_id, caption=caption,
+                                                                       reply_markup=reply_markup)
+                with self.__lock:
+                    self.__stats['reused'] += 1
+                return message
+            except telebot.apihelper.ApiTelegramException as err:
+                if not _is_error(err, _FILE_ID_ERRORS):  # ограничение частоты, заблокированный чат и т.п.
+                    raise
+                logger.debug(f'tg_bot/bot_utils/photo_sender.py file_id не принят, загружаем фото: {err=}')
+                self.__forget(link)
+
+        if load is None and self.__can_send_url(link):
+            try:
+                message = self.__bot.send_photo(chat_id, link, caption=caption, reply_markup=reply_markup)
+                with self.__lock:
+                    self.__stats['by_url'] += 1
+                self.__save_file_id(link, message)
+                return message
+            except telebot.apihelper.ApiTelegramException as err:
+                if not _is_error(err, _URL_ERRORS):  # ошибка не связана со ссылкой.
+                    raise
+                logger.debug(f'tg_bot/bot_utils/photo_sender.py Ссылка не принята, загружаем фото: {err=}')
+                self.__mark_bad_domain(link)
+
+        pict: bytes = load() if load is not None else self.__cache_foto.check_cache(link=link)
+        message = self.__bot.send_photo(chat_id, pict, caption=caption, reply_markup=reply_markup)
+        with self.__lock:
+            self.__stats['uploaded'] += 1
+        self.__save_file_id(link, message)
+        return message
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Метод возвращает счетчики.
+        Returns:
+            Dict: reused - отправлено по file_id, uploaded - загружено, expired - file_id не принят,
+                by_url - отправлено ссылкой, url_failed - ссылка не принята, entries, bad_domains.
+        """
+        with self.__lock:
+            return dict(self.__stats, entries=len(self.__file_ids), bad_domains=len(self.__bad_domains))
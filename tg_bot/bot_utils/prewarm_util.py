@@ -0,0 +1,100 @@
+import threading
+from typing import List, Tuple
+
+from api_site import main as get_api
+from api_site import main_pages as get_api_pages
+from api_site import count_missing_pages
+from api_site.getiing_requests.rate_limiter import request_priority, PRIORITY_BACKGROUND
+from api_site.utils.result_set import ResultSet, PRICE, RATING
+from common_utils import Setting
+from common_utils import logger
+from tg_bot.bot_utils.cache_foto import CacheFoto
+from tg_bot.bot_utils.manager_db_util import ManagerDB
+from tg_bot.bot_utils.photo_sender import PhotoSender
+
+
+class PrewarmCache(threading.Thread):
+    """
+    Фоновый поток, который заранее заполняет кеш результатов поиска и кеш фото самыми частыми запросами.
+
+    Methods:
+        run(): Выполняет прогрев при запуске и затем каждые Setting.get_prewarm_interval() секунд.
+        prewarm(): Выполняет один прогрев.
+        stop(): Останавливает поток.
+
+    Notes:
+        Самые частые запросы за последние Setting.get_prewarm_days() дней извлекаются из таблицы History.
+        Запросы, для которых в кеше уже есть актуальный результат, не расходуют запросы к API.
+        За один прогрев выполняется не более Setting.get_prewarm_budget() запросов к API,
+        все они выполняются с фоновым приоритетом (PRIORITY_BACKGROUND).
+        Фото загружаются только если Setting.get_photo_delivery_mode() == 'upload', фото, которые будут
+        отправлены по file_id (PhotoSender.needs_bytes), не загружаются.
+    """
+
+    def __init__(self, photo_sender: PhotoSender) -> None:
+        """
+        Params:
+            photo_sender (PhotoSender): Определяет, какие фото будут отправлены байтами и должны быть в кеше.
+        """
+        super().__init__(name='prewarm_cache', daemon=True)
+        self.__stop_event: threading.Event = threading.Event()
+        self.__cache_foto: CacheFoto = CacheFoto()
+        self.__photo_sender: PhotoSender = photo_sender
+
+    def run(self) -> None:
+        """Метод выполняет прогрев кеша до остановки потока."""
+        while not self.__stop_event.is_set():
+            try:
+                self.prewarm()
+            except Exception as err:
+                logger.error(f'tg_bot/bot_utils/prewarm_util.py Не удалось выполнить прогрев кеша: {err=}')
+            self.__stop_event.wait(Setting.get_prewarm_interval())
+
+    def stop(self) -> None:
+        """Метод останавливает поток."""
+        self.__stop_event.set()
+
+    def prewarm(self) -> None:
+        """Метод выполняет один прогрев кеша результатов поиска и фото."""
+        popular: List[Tuple[str, str, int]] = ManagerDB.read_popular_requests(days=Setting.get_prewarm_days(),
+                                                                              limit=Setting.get_prewarm_queries())
+        budget: int = Setting.get_prewarm_budget()
+        warmed: int = 0
+        with request_priority(PRIORITY_BACKGROUND):
+            for request, method, _ in popular:
+                if self.__stop_event.is_set():
+                    break
+                # /low и /high начинают с первой страницы, /custom запрашивает Setting.get_search_pages().
+                pages: Tuple[int, ...] = Setting.get_search_pages() if '/custom' in method else (1,)
+                cost: int = count_missing_pages('Поиск товара', request, pages, country='ru', language='ru')
+                if cost > budget:
+                    continue
+                budget -= cost
+                if '/custom' not in method:
+                    result: ResultSet = get_api(method='Поиск товара', product=request, country='ru',
+                                                language='ru', page=1)
+                else:
+                    result: ResultSet = get_api_pages(method='Поиск товара', product=request,
+                                                      pages=pages, country='ru', language='ru')
+                self.__prewarm_photos(result or ResultSet(), method)
+                warmed += 1
+        logger.info(f'Прогрев кеша: запросов {warmed} из {len(popular)}, '
+                    f'израсходовано запросов к API {Setting.get_prewarm_budget() - budget}, '
+                    f'кеш фото: {CacheFoto.get_stats()}')
+
+    def __prewarm_photos(self, result: ResultSet, method: str) -> None:
+        """Метод загружает в кеш фото первых товаров в том порядке, в котором их увидит пользователь."""
+        if Setting.get_photo_delivery_mode() != 'upload':  # фото отправляются ссылкой, кеш фото не нужен.
+            return
+        if 'up /custom' in method:
+            result = result.query(sort_by=PRICE, reverse=True)
+        elif 'down /custom' in method:
+            result = result.query(sort_by=PRICE)
+        elif 'rating /custom' in method:
+            result = result.query(sort_by=RATING, reverse=True)
+        for any_product in result[:Setting.get_prewarm_photos()]:
+            if any_product.get_link_photo() and self.__photo_sender.needs_bytes(any_product.get_link_photo()):
+                try:
+                    self.__cache_foto.check_cache(link=any_product.get_link_photo())
+                except Exception as err:
+                    logger.debug(f'Прогрев кеша: не удалось загрузить фото {any_product.get_link_photo()}: {err=}')
@@ -1,5 +1,12 @@
+from typing import Dict
+
 from api_site.utils.product_obj import Product
 
+# Обозначения валют для вывода цены, код без обозначения выводится как есть.
+# Цена без указания валюты выводится в рублях, как и до разбора валюты.
+_CURRENCY_SIGNS: Dict[str | None, str] = {None: 'руб.', 'RUB': 'руб.', 'USD': '$', 'EUR': '€', 'GBP': '£',
+                                          'CNY': '¥', 'KZT': '₸', 'UAH': '₴', 'BYN': 'бел. руб.'}
+
 
 def read_pattern(any_product: Product) -> str:
     """
@@ -10,11 +17,13 @@ def read_pattern(any_product: Product) -> str:
     Returns:
         str: Описание товара.
     """
+    currency: str | None = any_product.get_currency()
+    price: str = f'{any_product.get_price()} {_CURRENCY_SIGNS.get(currency, currency)}'
     pattern: str = (f"Название:  {any_product.get_product_title()}\n"
                     f"Рейтинг: {any_product.get_product_rating()}\n"
                     f"О товаре: {any_product.get_product_description()}\n"
                     f"Атрибуты: {any_product.get_product_attributes()}\n"
-                    f"Цена: {any_product.get_price()} руб.\n"
+                    f"Цена: {price}\n"
                     f"Название магазина: {any_product.get_store_name()}\n"
                     f"Доставка: {any_product.get_shipping()}\n"
                     )
@@ -24,7 +33,7 @@ def read_pattern(any_product: Product) -> str:
         pattern: str = (f"Название:  {any_product.get_product_title()}\n"
                         f"Рейтинг: {any_product.get_product_rating()}\n"
                         f"О товаре: {any_product.get_product_description()}\n"
-                        f"Цена: {any_product.get_price()} руб.\n"
+                        f"Цена: {price}\n"
                         f"Название магазина: {any_product.get_store_name()}\n"
                         f"Доставка: {any_product.get_shipping()}\n"
                         )
@@ -34,7 +43,7 @@ def read_pattern(any_product: Product) -> str:
         pattern: str = (f"Название:  {any_product.get_product_title()}\n"
                         f"Рейтинг: {any_product.get_product_rating()}\n"
                         f"Атрибуты: {any_product.get_product_attributes()}\n"
-                        f"Цена: {any_product.get_price()} руб.\n"
+                        f"Цена: {price}\n"
                         f"Название магазина: {any_product.get_store_name()}\n"
                         f"Доставка: {any_product.get_shipping()}\n")
 
@@ -44,7 +53,7 @@ def read_pattern(any_product: Product) -> str:
         else:
             pattern: str = (f"Название:  {any_product.get_product_title()}\n"
                             f"Рейтинг: {any_product.get_product_rating()}\n"
-                            f"Цена: {any_product.get_price()} руб.\n"
+                            f"Цена: {price}\n"
                             f"Название магазина: {any_product.get_store_name()}\n"
                             f"Доставка: {any_product.get_shipping()}\n"
                             )
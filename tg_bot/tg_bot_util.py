@@ -1,15 +1,23 @@
-from typing import IO, List, Dict, Optional
+from collections.abc import Sequence
+from typing import List, Dict, Optional
 import telebot
 from telebot import types
 import random
 
 from api_site.utils.product_obj import Product
+from api_site.utils.result_set import PriceBand, ResultSet, PRICE, RATING
 from common_utils import Setting
 from api_site import main as get_api
+from api_site import main_pages as get_api_pages
+from api_site import is_search_available
 from common_utils import logger
 from data_users.models.history import History
 from tg_bot.bot_utils.bot_data import get_text_help, get_text_about, create_date_favorite
 from tg_bot.bot_utils.cache_foto import CacheFoto
+from tg_bot.bot_utils.page_cursor import PageCursor
+from tg_bot.bot_utils.photo_prefetch import PhotoPrefetcher
+from tg_bot.bot_utils.photo_sender import PhotoSender
+from tg_bot.bot_utils.prewarm_util import PrewarmCache
 from tg_bot.bot_utils.read_pattern_util import read_pattern
 from tg_bot.bot_utils.manager_db_util import ManagerDB
 
@@ -36,6 +44,7 @@ class Bot:
          result_price_menu(): Выводит результаты и предоставляет интерфейс ориентации в меню.
          learn_result(): Отвечает за ориентацию в меню вывода информации.
          product_search_menu(): "/custom" меню.
+         resort_listing(): Повторно сортирует и фильтрует результат "/custom" без нового запроса.
          about_menu(): Меню предоставляет более подробную информацию о возможностях бота в отличии от "/help".
          run(): Отвечает за запуск бота и с помощью методов, которые находятся непосредственно в нем,
          перехватывает основные команды пользователя.
@@ -55,12 +64,17 @@ class Bot:
         """
             Params:
                 bot: Объект бота
-                data: Dict: Данные запросов пользователей.
+                data: Dict: Данные запросов пользователей (список товаров или PageCursor).
                 page: Dict: Индексы страниц пользователей.
                 param: bool: С помощью данного параметра определяется какой вывод данных необходимо совершить.
                 sort: bool: С помощью данного параметра определяется тип сортировки данных.
                 cache_foto: Хранить временно подгруженные фото в кеше.
+                photo_sender: Отправляет фото по file_id Telegram, загружая байты только при первой отправке.
+                photo_prefetch: Загружает в фоне фото следующих товаров, пока пользователь смотрит текущий.
                 favorite_dict: Dict: Данные сохраненных товаров пользователей.
+                prewarm: Фоновый прогрев кеша популярными запросами из истории.
+                result_set: Dict: Результаты "/custom" (ResultSet) для повторной сортировки и фильтров.
+                listing: Dict: Текущие сортировка и ценовой диапазон результатов "/custom".
         """
 
         self.bot = telebot.TeleBot(Setting.get_token_tg())
@@ -70,7 +84,13 @@ class Bot:
         self.sort: Dict = {}
         self.favorite_dict_cache: Dict = {}
         self.cache_foto = CacheFoto()
+        self.photo_sender = PhotoSender(self.bot, self.cache_foto)
+        self.photo_prefetch = PhotoPrefetcher(self.cache_foto,
+                                              skip=lambda link: not self.photo_sender.needs_bytes(link))
         self.favorite_dict: Dict = {}
+        self.prewarm = PrewarmCache(self.photo_sender)
+        self.result_set: Dict = {}
+        self.listing: Dict = {}
 
     def start_menu(self, message: telebot.types.Message) -> None:
         """
@@ -78,16 +98,22 @@ class Bot:
         """
         text_output: str = (f'доброго времени суток 👋, {message.from_user.first_name}!\n'
                             f'Вас приветствует бот который поможет найти нужные вам товары из интернета. 💻')
-        file_picture: IO[bytes] = open('./logo.webp', 'rb')
-        self.bot.send_photo(message.chat.id, file_picture)
+        self.photo_sender.send(message.chat.id, './logo.webp', load=self.__read_logo)
         self.bot.send_message(message.chat.id, text_output)
         self.main_menu(message)
 
+    @staticmethod
+    def __read_logo() -> bytes:
+        """Метод читает логотип бота."""
+        with open('./logo.webp', 'rb') as file_picture:
+            return file_picture.read()
+
     def main_menu(self, message: telebot.types.Message) -> None:
         """
         Данный метод представляет собой основное меню телеграмм бота. Где пользователю предоставлены основной функционал
         взаимодействия с ним.
         """
+        self.photo_prefetch.cancel(message.chat.id)  # Пользователь вышел из списка товаров.
         text: str = f'Главное меню 📃'
         marcup = types.ReplyKeyboardMarkup(resize_keyboard=True)
         button_about = types.KeyboardButton('o боте 🧸')
@@ -163,6 +189,8 @@ class Bot:
                             command = '📈 /custom'
                         case command if 'def /custom' in command:
                             command = '📊 /custom'
+                        case command if 'rating /custom' in command:
+                            command = '⭐ /custom'
                         case command if 'one /low' in command:
                             command = '🔎 /low'
                         case command if 'max /high' in command:
@@ -207,6 +235,9 @@ class Bot:
             case command if "составить список по убыванию цены" in command:
                 self.sort[message.chat.id] = True
                 self.input_search_supplies_menu(message)
+            case command if "составить список по рейтингу" in command:
+                self.sort[message.chat.id] = 'rating'
+                self.input_search_supplies_menu(message)
             case _:
                 self.main_click_menu(message)
 
@@ -286,39 +317,32 @@ class Bot:
                     self.page[message.chat.id] = 0  # Сбрасываем страницу
 
                     if param is None:  # Вывод с сортировкой.
-                        result: List[Product] = get_api(method='Поиск товара', product=text_input_user, country='ru',
-                                                        language='ru',
-                                                        page=2)
-                        if sort is True:  # Вывод отсортированного результата по убыванию.
-                            self.sort[message.chat.id] = None
-                            result = sorted(result, key=lambda x: x.get_price(), reverse=True)
-
-                        elif sort is False:  # Вывод отсортированного результата по увеличению.
-                            self.sort[message.chat.id] = None
-                            result = sorted(result, key=lambda x: x.get_price(), reverse=False)
-
-                        if len(result) > 15:
-                            self.data[message.chat.id] = result[:15]
-
-                        else:
-                            self.data[message.chat.id] = result
-                        self.result_price_menu(message)
+                        result: ResultSet = get_api_pages(method='Поиск товара', product=text_input_user,
+                                                          pages=Setting.get_search_pages(), country='ru',
+                                                          language='ru')
+                        self.sort[message.chat.id] = None
+                        # Результат сохраняется для повторной сортировки и фильтров без нового запроса.
+                        self.result_set[message.chat.id] = result
+                        self.listing[message.chat.id] = {'sort': sort, 'band': None}
+                        self.data[message.chat.id] = self.__custom_listing(result, sort=sort)
 
                     elif param is False:  # Выдаем один результат
                         self.param[message.chat.id] = None
-                        result: List[Product] = [random.choice(
-                            get_api(method='Поиск товара', product=text_input_user, country='ru', language='ru',
-                                    page=1))]
-                        self.data[message.chat.id] = result
-                        self.result_price_menu(message)
-
-                    else:  # Выдаем максимальное кол-во результатов=30, можно расшить до page += 1.
-                        result: List[Product] = get_api(method='Поиск товара', product=text_input_user, country='ru',
-                                                        language='ru',
-                                                        page=3)
+                        self.result_set.pop(message.chat.id, None)
+                        products: List[Product] | None = get_api(method='Поиск товара', product=text_input_user,
+                                                                 country='ru', language='ru', page=1)
+                        self.data[message.chat.id] = [random.choice(products)] if products else []
+
+                    else:  # Выдаем все результаты, страницы API загружаются по мере просмотра.
+                        result: PageCursor = PageCursor(method='Поиск товара', product=text_input_user,
+                                                        country='ru', language='ru')
                         self.data[message.chat.id] = result
                         self.param[message.chat.id] = None
-                        self.result_price_menu(message)
+                        self.result_set.pop(message.chat.id, None)
+
+                    if len(self.data[message.chat.id]) == 0:  # Пустой результат любой из команд.
+                        raise TypeError('Запрос не дал результатов.')
+                    self.result_price_menu(message)
             else:
                 raise TypeError('Не верный тип данных.')
 
@@ -326,7 +350,11 @@ class Bot:
             logger.error(
                 f'tg_bot/tg_bot_util.py Не удалось обработать запрос от пользователя @{message.from_user.username}'
                 f', запрос {message.text}, param = {param}, sort = {sort}.  TypeError: {err}', )
-            self.bot.send_message(message.chat.id, 'Произошла ошибка. попробуйте еще раз.')
+            if is_search_available():
+                self.bot.send_message(message.chat.id, 'Произошла ошибка. попробуйте еще раз.')
+            else:  # API недоступен, а результата нет в кеше.
+                self.bot.send_message(message.chat.id, 'Сервис поиска временно недоступен. '
+                                                       'Доступны результаты ранее выполненных запросов.')
             self.main_click_menu(message)
 
     def result_price_menu(self, message: telebot.types.Message, previous_message=None,
@@ -367,17 +395,23 @@ class Bot:
 
         """
         page_num: int = self.page.get(message.chat.id, 0)  # Собираем данные.
-        result: list = self.data.get(message.chat.id, None)
+        result: Sequence = self.data.get(message.chat.id, None)
         sort: bool = self.sort.get(message.chat.id)
         param: bool = self.param.get(message.chat.id)
         cache_list: List = self.favorite_dict_cache.get(message.chat.id)
         try:
-            if isinstance(result, list) and len(result) >= 1:  # Структурируем данные.
-                text: str = f'Для навигации используйте клавиатуру ⬅️[{page_num + 1}-й из {len(result)}]➡️.'
-                any_product: Product = result[page_num]
+            if isinstance(result, Sequence) and len(result) >= 1:  # Структурируем данные.
+                any_product: Product = result[page_num]  # PageCursor загружает следующую страницу при необходимости.
+                upcoming: Sequence = result[page_num + 1:page_num + 1 + Setting.get_photo_prefetch_count()]
+                self.photo_prefetch.schedule(message.chat.id, [product.get_link_photo() for product in upcoming])
+                # Кнопка "следующий" для PageCursor выводится, только если следующий товар существует.
+                has_next: bool = isinstance(result, PageCursor) and result.has_item(page_num + 1)
+                has_more: bool = isinstance(result, PageCursor) and result.has_more()
+                total: str = f'{len(result)}+' if has_more else f'{len(result)}'
+                text: str = f'Для навигации используйте клавиатуру ⬅️[{page_num + 1}-й из {total}]➡️.'
+
                 pattern: str = read_pattern(any_product)
                 url: str = any_product.get_offer_page_url()
-                pict: bytes = self.cache_foto.check_cache(pattern=pattern, link=any_product.get_link_photo())
                 # Создаем клавиатуру.
                 marcup_inline = types.InlineKeyboardMarkup()
                 marcup_inline.add(types.InlineKeyboardButton('Ссылка для перехода 🔗', url=url))
@@ -418,16 +452,21 @@ class Bot:
                                                                      f'{marker}', callback_data='favorite')
                         marcup_inline.add(button_favorite)
 
-                if len(result) != 1:  # Создаем кнопки навигации.
-                    if (page_num > 0) and (page_num <= len(result) - 2):
+                if len(result) != 1 or has_next:  # Создаем кнопки навигации.
+                    if (page_num > 0) and (page_num <= len(result) - 2 or has_next):
                         marcup_inline.add(button_back, button_next)
-                    elif page_num == len(result) - 1:
+                    elif page_num == len(result) - 1 and not has_next:
                         marcup_inline.add(button_back)
                     else:
                         marcup_inline.add(button_next)
 
+                result_set: ResultSet | None = self.result_set.get(message.chat.id)
+                if result_set is not None and len(result_set) > 1:  # Кнопки сортировки и фильтров "/custom".
+                    self.__add_listing_buttons(marcup_inline, result_set)
+
                 marcup_inline.add(button_main)  # Все готово к отправке сообщения.
-                self.bot.send_photo(message.chat.id, pict, caption=f'{pattern}\n{text}', reply_markup=marcup_inline)
+                self.photo_sender.send(message.chat.id, any_product.get_link_photo(), caption=f'{pattern}\n{text}',
+                                       reply_markup=marcup_inline)
 
                 if previous_message is not None:  # Проверяем старое сообщение.
                     try:
@@ -445,6 +484,67 @@ class Bot:
             self.bot.send_message(message.chat.id, 'Произошла ошибка. попробуйте еще раз.')
             self.input_search_supplies_menu(message)
 
+        except IndexError:  # Результаты закончились раньше, чем ожидалось (PageCursor).
+            self.page[message.chat.id] = max(len(result) - 1, 0)
+            self.bot.send_message(message.chat.id, 'Больше результатов нет.')
+            if len(result) > 0:
+                self.result_price_menu(message, previous_message=previous_message)
+            else:
+                self.input_search_supplies_menu(message)
+
+    @staticmethod
+    def __custom_listing(result: ResultSet, sort: bool | str | None,
+                         band: Optional[PriceBand] = None) -> List[Product]:
+        """
+        Метод возвращает товары результата "/custom" с учетом сортировки и ценового диапазона.
+        Params:
+            result: ResultSet: Результат запроса.
+            sort: True - по убыванию цены, False - по возрастанию цены, 'rating' - по рейтингу, None - без сортировки.
+            band: Optional[PriceBand]: Ценовой диапазон (ResultSet.price_bands()).
+        """
+        match sort:
+            case True:
+                return result.query(sort_by=PRICE, reverse=True, price_range=band)
+            case False:
+                return result.query(sort_by=PRICE, price_range=band)
+            case 'rating':
+                return result.query(sort_by=RATING, reverse=True, price_range=band)
+            case _:
+                return result.query(price_range=band)
+
+    @staticmethod
+    def __add_listing_buttons(marcup_inline: types.InlineKeyboardMarkup, result_set: ResultSet) -> None:
+        """Метод добавляет кнопки сортировки и ценовых диапазонов результата "/custom"."""
+        marcup_inline.add(types.InlineKeyboardButton('Цена 📈', callback_data='resort_price_up'),
+                          types.InlineKeyboardButton('Цена 📉', callback_data='resort_price_down'),
+                          types.InlineKeyboardButton('Рейтинг ⭐', callback_data='resort_rating'))
+        bands: List[PriceBand] = result_set.price_bands(3)
+        marcup_inline.add(*(types.InlineKeyboardButton(f'{band.low:.0f}-{band.high:.0f}', callback_data=f'band_{i}')
+                            for i, band in enumerate(bands)),
+                          types.InlineKeyboardButton('Все цены', callback_data='band_all'))
+
+    def resort_listing(self, message: telebot.types.Message, previous_message=None, **changes) -> None:
+        """
+        Метод повторно сортирует и фильтрует сохраненный результат "/custom" без нового запроса к API.
+        Params:
+            message: Объект PyTeleBotAPI.
+            previous_message: Отвечает за удаление сообщения.
+            **changes: sort (True | False | 'rating') и/или band (номер ценового диапазона или None).
+        """
+        result_set: ResultSet | None = self.result_set.get(message.chat.id)
+        if result_set is None:
+            self.bot.send_message(message.chat.id, 'Нет данных.')
+            return
+        listing: Dict = self.listing.setdefault(message.chat.id, {'sort': None, 'band': None})
+        listing.update(changes)
+        band: Optional[PriceBand] = None
+        bands: List[PriceBand] = result_set.price_bands(3)
+        if listing['band'] is not None and listing['band'] < len(bands):
+            band = bands[listing['band']]
+        self.data[message.chat.id] = self.__custom_listing(result_set, sort=listing['sort'], band=band)
+        self.page[message.chat.id] = 0
+        self.result_price_menu(message, previous_message=previous_message)
+
     def product_search_menu(self, message: telebot.types.Message) -> None:
         """
         Метод предоставляет пользователю /custom меню предоставления результатов.
@@ -456,10 +556,12 @@ class Bot:
         price_butt = types.KeyboardButton("Составить список без сортировки 📊")
         min_price_butt = types.KeyboardButton("Составить список по возрастанию цены 📈")
         max_price_butt = types.KeyboardButton("Составить список по убыванию цены 📉")
+        rating_butt = types.KeyboardButton("Составить список по рейтингу ⭐")
         marcup_under.add(butt)
         marcup_under.add(price_butt)
         marcup_under.add(max_price_butt)
         marcup_under.add(min_price_butt)
+        marcup_under.add(rating_butt)
         self.bot.send_message(message.chat.id, 'Для возврата назад, нажмите Главное меню 📃', reply_markup=marcup_under)
         self.bot.register_next_step_handler(message, self.next_menu_for_custom_request)
 
@@ -512,6 +614,8 @@ class Bot:
         try:
             if isinstance(favorite_data, list) and len(favorite_data) > 0:
                 any_product: list = favorite_data[page_num]  # Извлекаем данные.
+                upcoming: List = favorite_data[page_num + 1:page_num + 1 + Setting.get_photo_prefetch_count()]
+                self.photo_prefetch.schedule(message.chat.id, [product[1] for product in upcoming])
                 url: str = any_product[0]
                 marcup_inline = types.InlineKeyboardMarkup()  # Формируем образ клавиатуры.
 
@@ -530,7 +634,6 @@ class Bot:
                 button_next = types.InlineKeyboardButton('следующий ➡', callback_data='next_favor')
                 button_back = types.InlineKeyboardButton('⬅ предыдущий', callback_data='back_favor')
                 button_main = types.InlineKeyboardButton('Главное меню 📃', callback_data='main')
-                pict: bytes = self.cache_foto.check_cache(pattern=any_product[2], link=any_product[1])
 
                 if len(favorite_data) != 1:
                     if (page_num > 0) and (page_num <= len(favorite_data) - 2):
@@ -541,8 +644,8 @@ class Bot:
                         marcup_inline.add(button_next)
                 text: str = f'Для навигации используйте клавиатуру ⬅️[{page_num + 1}-й из {len(favorite_data)}]➡️'
                 marcup_inline.add(button_main)  # Данные и клавиатура отформатированы и готовы к отправке пользователю.
-                self.bot.send_photo(message.chat.id, pict, caption=f'{any_product[2]}\n{text}',
-                                    reply_markup=marcup_inline)
+                self.photo_sender.send(message.chat.id, any_product[1], caption=f'{any_product[2]}\n{text}',
+                                       reply_markup=marcup_inline)
 
                 if previous_message is not None:  # Удаляем старое сообщение.
                     try:
@@ -579,6 +682,7 @@ class Bot:
         """
         Метод выполняет функцию запуска бота.
         """
+        self.prewarm.start()  # Прогрев кеша популярными запросами при запуске и далее по расписанию.
 
         @self.bot.message_handler(commands=["start"])
         def start(message) -> None:
@@ -642,7 +746,17 @@ class Bot:
                 Если он не будут определены, будут проверяться команды обращения в историю событий.
             """
 
-            if 'next_favor' in callback_query.data:
+            if callback_query.data.startswith('resort_'):  # Сортировка результата "/custom" без нового запроса.
+                sort: bool | str = {'resort_price_up': False, 'resort_price_down': True,
+                                    'resort_rating': 'rating'}.get(callback_query.data)
+                self.resort_listing(callback_query.message, previous_message=callback_query.message, sort=sort)
+
+            elif callback_query.data.startswith('band_'):  # Ценовой диапазон результата "/custom".
+                band: str = callback_query.data.split('_')[1]
+                self.resort_listing(callback_query.message, previous_message=callback_query.message,
+                                    band=None if band == 'all' else int(band))
+
+            elif 'next_favor' in callback_query.data:
                 self.page[callback_query.from_user.id] += 1
                 self.favorite_menu(callback_query.message, previous_message=callback_query.message)
 
@@ -692,6 +806,9 @@ class Bot:
 
                         elif '📊' in callback_query.data:
                             self.sort[callback_query.from_user.id] = None
+
+                        elif '⭐' in callback_query.data:
+                            self.sort[callback_query.from_user.id] = 'rating'
                         self.check_text_for_requests_menu(callback_query.message, call_func=rq)
 
                     elif "/high" in callback_query.data and len(callback_query.data) > len('/high'):